@@ -10,4 +10,32 @@ to support real-time code snippet processing.
 - Consider adding package-level configuration
 - Add package-level type hints
 - Consider implementing proper plugin architecture
-"""
\ No newline at end of file
+"""
+import importlib
+
+# Public classes and the shared message_manager, imported from their submodule
+# on first access (PEP 562) so that importing the package never pulls in
+# curses, PIL or Tesseract up front
+_LAZY_EXPORTS = {
+    "ProcessManager": ".process_manager",
+    "ScreenshotManager": ".screenshot_manager",
+    "OCRProcessor": ".ocr_processor",
+    "TerminalUI": ".terminal_ui",
+    "MessageManager": ".message_system",
+    "message_manager": ".message_system",
+    "ConfigManager": ".config_loader",
+    "DiscoveryManager": ".discovery_manager",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # Cache so later lookups skip __getattr__
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -6,10 +6,26 @@ import os
 import time
 import logging # Import logging
 from abc import ABC, abstractmethod
-from .color_scheme import HEADER_PAIR, MENU_PAIR, SELECTED_VIEW, get_view_color
+from .color_scheme import HEADER_PAIR, MENU_PAIR, SELECTED_VIEW, STATUS_STOPPED, get_view_color
+
+def _build_tab_layout(tabs):
+    """Return (text, view_name, x_offset, width) for each header tab."""
+    layout = []
+    x_offset = 2
+    for tab in tabs:
+        tab_text = f" {tab} "
+        layout.append((tab_text, tab.split(":")[1].lower(), x_offset, len(tab_text)))
+        x_offset += len(tab_text) + 1 # Add spacing
+    return tuple(layout)
+
+# Header tabs are static, so they are laid out once at import
+TAB_LAYOUT = _build_tab_layout(("1:Status", "2:Screenshot", "3:Debug"))
 
 class BaseView(ABC):
     """Abstract base class for all terminal UI views."""
+    # Help box layout keyed by (help content, width, height); shared across views
+    _help_cache: dict[tuple, tuple[int, int, int, int, list[str]]] = {}
+
     def __init__(self, stdscr, process_manager):
         self.stdscr = stdscr
         self.process_manager = process_manager
@@ -23,7 +39,39 @@ class BaseView(ABC):
         self.win = curses.newwin(win_height, win_width, win_y, win_x)
         self.win.keypad(True) # Enable special keys
         self.view_name = "Base" # Should be overridden by subclasses
+        # Precomputed attributes for the chrome drawn on every frame
+        self._attr_header = curses.color_pair(HEADER_PAIR)
+        self._attr_header_bold = self._attr_header | curses.A_BOLD
+        self._attr_menu = curses.color_pair(MENU_PAIR)
+        self._attr_selected = curses.color_pair(SELECTED_VIEW) | curses.A_BOLD
+        self._attr_error = curses.color_pair(STATUS_STOPPED) | curses.A_BOLD
         self.show_help = False
+        self._help_win = None
+        self._help_key = None
+        # Damage tracking: header/footer persist on stdscr between ticks and are
+        # only repainted when the layout is invalidated or the clock changes.
+        self._last_view_name = None
+        self._last_dims = None
+        self._last_time_str = None
+        self._cached_time_str = ""
+        self._cached_time_epoch = 0
+        # Dirty-flag gate: draw() is a no-op unless something changed or the
+        # clock ticked over to a new second.
+        self.dirty = True
+        self._last_draw_second = None
+        if hasattr(process_manager, 'add_change_listener'):
+            process_manager.add_change_listener(self.mark_dirty)
+
+    def mark_dirty(self):
+        """Request a redraw on the next tick. Safe to call from any thread."""
+        self.dirty = True
+
+    def invalidate(self):
+        """Force the header and footer to be repainted on the next draw (e.g. after stdscr.clear())."""
+        self._last_view_name = None
+        self._last_dims = None
+        self._last_time_str = None
+        self.dirty = True
 
     def resize(self, height, width):
         """Handle terminal resize."""
@@ -46,27 +94,21 @@ class BaseView(ABC):
         try:
             # Check width before drawing
             if scr_w > 0:
-                self.stdscr.hline(0, 0, ' ', scr_w, curses.color_pair(HEADER_PAIR))
+                self.stdscr.hline(0, 0, ' ', scr_w, self._attr_header)
                 title = " Threethreeter Local Backend Monitor "
                 # Ensure title fits, adjust centering if needed
                 start_col = max(0, (scr_w - len(title)) // 2)
                 # Truncate title if needed
-                self.stdscr.addstr(0, start_col, title[:scr_w], curses.color_pair(HEADER_PAIR) | curses.A_BOLD)
+                self.stdscr.addstr(0, start_col, title[:scr_w], self._attr_header_bold)
 
             # Draw view tabs only if width allows
             if scr_w > 10: # Need some minimum width for tabs
-                tabs = ["1:Status", "2:Screenshot", "3:Debug"]
-                x_offset = 2
-                for i, tab in enumerate(tabs):
-                    view_name = tab.split(":")[1].lower()
-                    attr = curses.color_pair(SELECTED_VIEW) | curses.A_BOLD if view_name == current_view else curses.color_pair(HEADER_PAIR)
+                for tab_text, view_name, x_offset, tab_width in TAB_LAYOUT:
                     # Check width before drawing tab
-                    tab_text = f" {tab} "
-                    if x_offset + len(tab_text) < scr_w: # Check if the whole tab fits
-                        self.stdscr.addstr(1, x_offset, tab_text, attr)
-                        x_offset += len(tab_text) + 1 # Add spacing
-                    else:
+                    if x_offset + tab_width >= scr_w:
                         break # Stop drawing tabs if no more space
+                    attr = self._attr_selected if view_name == current_view else self._attr_header
+                    self.stdscr.addstr(1, x_offset, tab_text, attr)
 
         except curses.error as e:
             # Log errors if drawing outside screen bounds (e.g., small terminal)
@@ -74,25 +116,35 @@ class BaseView(ABC):
             pass
 
     def draw_footer(self):
-        """Draw the common footer."""
+        """Draw the common footer. Only the clock field is rewritten once the bar is drawn."""
         # Use self.stdscr.getmaxyx() for main screen dimensions
         scr_h, scr_w = self.stdscr.getmaxyx()
+        # Only format the clock when the wall-clock second changes
+        now = int(time.time())
+        if now != self._cached_time_epoch:
+            self._cached_time_str = time.strftime("%H:%M:%S", time.localtime(now))
+            self._cached_time_epoch = now
+        current_time = self._cached_time_str
+        if current_time == self._last_time_str:
+            return # Nothing changed since the last tick
         try:
             # Draw footer line only if width > 0 and height > 0
             if scr_w > 0 and scr_h > 0:
-                self.stdscr.hline(scr_h - 1, 0, ' ', scr_w, curses.color_pair(MENU_PAIR))
-
-                # Draw footer text if width allows
                 footer_text = " (q) Quit | (h) Help "
-                if scr_w > len(footer_text):
-                    self.stdscr.addstr(scr_h - 1, 1, footer_text, curses.color_pair(MENU_PAIR))
+                if self._last_time_str is None:
+                    # Static part of the footer, only after an invalidation
+                    self.stdscr.hline(scr_h - 1, 0, ' ', scr_w, self._attr_menu)
+
+                    # Draw footer text if width allows
+                    if scr_w > len(footer_text):
+                        self.stdscr.addstr(scr_h - 1, 1, footer_text, self._attr_menu)
 
                 # Add time if width allows
-                current_time = time.strftime("%H:%M:%S")
                 time_len = len(current_time)
                 # Ensure enough space for footer_text and time
                 if scr_w > len(footer_text) + time_len + 3: # +3 for spacing
-                    self.stdscr.addstr(scr_h - 1, scr_w - time_len - 2, current_time, curses.color_pair(MENU_PAIR))
+                    self.stdscr.addstr(scr_h - 1, scr_w - time_len - 2, current_time, self._attr_menu)
+                self._last_time_str = current_time
 
         except curses.error as e:
             # Log errors if drawing outside screen bounds
@@ -110,97 +162,134 @@ class BaseView(ABC):
         # Example: return [("q", "Quit"), ("h", "Toggle Help")]
         pass
 
+    def _help_layout(self, help_content):
+        """Return (box_height, box_width, start_y, start_x, lines) for the help box, memoized per content and size."""
+        cache_key = (tuple(help_content), self.width, self.height)
+        layout = BaseView._help_cache.get(cache_key)
+        if layout is None:
+            # Calculate overlay dimensions (both column widths in one pass)
+            max_key_len = max_desc_len = 0
+            for key, desc in help_content:
+                if len(key) > max_key_len:
+                    max_key_len = len(key)
+                if len(desc) > max_desc_len:
+                    max_desc_len = len(desc)
+            box_width = max(30, max_key_len + max_desc_len + 7) # Key: Desc
+            box_height = len(help_content) + 4 # Title + content + padding
+
+            # Center the box
+            start_y = (self.height - box_height) // 2
+            start_x = (self.width - box_width) // 2
+
+            lines = [f"{key.upper():<{max_key_len}} : {desc}" for key, desc in help_content]
+            layout = (box_height, box_width, start_y, start_x, lines)
+            BaseView._help_cache[cache_key] = layout
+        return cache_key, layout
+
     def draw_help_overlay(self):
-        """Draw the help overlay."""
+        """Stage the help overlay on top of the current frame; draw() flushes it with doupdate()."""
         help_content = self.get_help_content()
         if not help_content:
             return # Don't draw if no content
 
-        # Calculate overlay dimensions
-        max_key_len = max(len(key) for key, desc in help_content) if help_content else 0
-        max_desc_len = max(len(desc) for key, desc in help_content) if help_content else 0
-        box_width = max(30, max_key_len + max_desc_len + 7) # Key: Desc
-        box_height = len(help_content) + 4 # Title + content + padding
-
-        # Center the box
-        start_y = (self.height - box_height) // 2
-        start_x = (self.width - box_width) // 2
+        cache_key, (box_height, box_width, start_y, start_x, lines) = self._help_layout(help_content)
 
         # Ensure coordinates are valid
         if start_y < 0 or start_x < 0 or start_y + box_height > self.height or start_x + box_width > self.width:
              # Too small to draw help overlay, maybe show a message?
              try:
-                  self.win.addstr(1, 2, "Terminal too small for help", curses.A_BOLD | curses.color_pair(STATUS_STOPPED))
+                  self.win.addstr(1, 2, "Terminal too small for help", self._attr_error)
+                  self.win.noutrefresh()
              except curses.error: pass
              return
 
         try:
-            help_win = curses.newwin(box_height, box_width, start_y, start_x)
-            help_win.erase()
-            help_win.box()
-            help_win.addstr(1, (box_width - 10) // 2, " Help Menu ", curses.A_BOLD | curses.A_UNDERLINE)
-
-            for i, (key, desc) in enumerate(help_content):
-                help_win.addstr(i + 3, 3, f"{key.upper():<{max_key_len}} : {desc}")
-
-            help_win.refresh()
+            # Reuse the composed window while content and geometry are unchanged
+            if self._help_win is None or cache_key != self._help_key:
+                # Allocate once per box size; a terminal resize only moves it
+                if self._help_win is None or self._help_win.getmaxyx() != (box_height, box_width):
+                    self._help_win = curses.newwin(box_height, box_width, start_y, start_x)
+                else:
+                    self._help_win.mvwin(start_y, start_x)
+                help_win = self._help_win
+                help_win.erase()
+                help_win.box()
+                help_win.addstr(1, (box_width - 10) // 2, " Help Menu ", curses.A_BOLD | curses.A_UNDERLINE)
 
-            # Wait for any key press to close
-            self.stdscr.nodelay(False) # Blocking wait for key
-            self.stdscr.getch()
-            self.stdscr.nodelay(True) # Restore non-blocking
+                for i, line in enumerate(lines):
+                    help_win.addstr(i + 3, 3, line)
+                self._help_key = cache_key
+            else:
+                help_win = self._help_win
+                help_win.touchwin()
 
-            # Clean up - redraw underlying screen elements
-            self.stdscr.touchwin()
-            self.stdscr.refresh()
-            del help_win
+            # Stage the overlay over the content; the caller does the single doupdate()
+            help_win.noutrefresh()
 
         except curses.error as e:
              # Log error if help overlay fails
              logging.error(f"Failed to draw help overlay: {e}")
-             # Try to restore terminal state
-             self.stdscr.nodelay(True)
 
 
     def draw(self):
         """Draw the entire view (header, content, footer)."""
+        now = int(time.time())
+        if not self.dirty and now == self._last_draw_second:
+            return # Nothing changed since the last frame
+        # Clear the flag before drawing so changes arriving mid-draw trigger another frame
+        self.dirty = False
         try:
             # Get dimensions each time in case of resize
             scr_h, scr_w = self.stdscr.getmaxyx()
             # Check for minimal terminal size
             if scr_h < 5 or scr_w < 20:
+                 self.invalidate() # Header/footer must be repainted once the terminal grows
                  try:
                      self.stdscr.erase()
-                     self.stdscr.addstr(0, 0, "Terminal too small.", curses.A_BOLD | curses.color_pair(STATUS_STOPPED))
+                     self.stdscr.addstr(0, 0, "Terminal too small.", self._attr_error)
                      self.stdscr.refresh()
                  except curses.error: pass # Ignore if even this fails
                  return # Don't attempt further drawing
 
-            # Resize content window first
-            self.resize(scr_h, scr_w)
+            dims = (scr_h, scr_w)
+            # Resize content window first, but only when the size changed (or
+            # after an invalidation); otherwise it already has the right shape
+            if dims != self._last_dims:
+                self.resize(scr_h, scr_w)
 
-            self.stdscr.erase() # Clear entire screen
-            self.win.erase() # Clear content window
+            # Only blank stdscr and repaint the header when the layout changed;
+            # otherwise the header/footer cells are left untouched so doupdate()
+            # has nothing to send for them.
+            if dims != self._last_dims or self.view_name != self._last_view_name:
+                self.stdscr.erase()
+                self.draw_header(self.view_name)
+                self._last_time_str = None # Footer was erased as well
+                self._last_dims = dims
+                self._last_view_name = self.view_name
+
+            # The content window is rebuilt in memory each tick; curses diffs it
+            # against the physical screen so unchanged rows are not re-emitted.
+            self.win.erase()
 
             # Draw components, they now have internal checks
-            self.draw_header(self.view_name)
             self.draw_content() # Call subclass implementation
             self.draw_footer()
 
             # Refresh the main screen and the content window
             self.stdscr.noutrefresh()
             self.win.noutrefresh()
-            curses.doupdate()
-
+            # The help overlay stays up (re-staged each frame) until a key dismisses it
             if self.show_help:
                 self.draw_help_overlay()
-                self.show_help = False # Automatically hide after showing once
+            curses.doupdate()
+            self._last_draw_second = now
 
         except curses.error as e:
             # Log errors related to drawing (e.g., terminal too small)
             logging.error(f"Error drawing view {self.view_name}: {e}")
             # Attempt to draw a minimal error message if possible
             # This is the block causing the loop if it also fails
+            self.invalidate()
             try:
                  # Check dimensions *before* trying to write error
                  h, w = self.stdscr.getmaxyx()
@@ -221,8 +310,14 @@ class BaseView(ABC):
 
     def handle_input(self, key):
         """Handle common input keys."""
+        if self.show_help and key != curses.KEY_RESIZE:
+            # Any key dismisses the help overlay
+            self.show_help = False
+            self.invalidate() # Repaint what the overlay covered
+            return True
         if key == ord('h'):
             self.show_help = True
+            self.dirty = True
             return True # Indicate input was handled
         elif key == curses.KEY_RESIZE:
              # Let the main loop handle resize by redrawing
@@ -231,6 +326,7 @@ class BaseView(ABC):
              # Force redraw
              self.stdscr.clear()
              self.win.clear()
+             self.invalidate()
              return True
         # Allow subclasses to handle other keys or return False
         return False
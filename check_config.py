@@ -29,7 +29,7 @@ import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from .path_config import get_server_config_file, get_config_dir
-from .server_config import get_server_config
+from .server_config import get_server_config, load_json_cached
 
 def check_config_paths():
     """Check configuration paths and files."""
@@ -45,10 +45,9 @@ def check_config_paths():
     
     if os.path.exists(server_config_file):
         try:
-            with open(server_config_file, 'r') as f:
-                data = json.load(f)
-                print(f"  Valid JSON: Yes")
-                print(f"  Contents: {json.dumps(data, indent=2)}")
+            data = load_json_cached(server_config_file)
+            print(f"  Valid JSON: Yes")
+            print(f"  Contents: {json.dumps(data, indent=2)}")
         except Exception as e:
             print(f"  Valid JSON: No - {e}")
 
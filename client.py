@@ -20,64 +20,171 @@ Key Features:
 - Add proper connection state management
 - Implement proper SSL/TLS certificate validation
 """
-import os
 import sys
+import time
+import random
+import hashlib
+import queue
+import threading
 import logging
+import logging.handlers
+import functools
 import argparse
 import socketio
+from collections import OrderedDict
+from pathlib import Path
 from datetime import datetime
 # Ensure utils and core components are importable
 try:
     from .config_loader import config as config_manager # Use ConfigManager
-    # Assuming ScreenshotManager now uses OCRProcessor internally or OCRProcessor is separate
-    from .ocr_processor import OCRProcessor
-    from .message_utils import MessageType # Import MessageType
-    from event_utils import EventType # Import EventType
+    from .message_utils import MessageType, create_internal_ocr_result_payload, socketio_json # Import MessageType
+    from .event_utils import EventType # Import EventType
 except ImportError as e:
     print(f"Error importing modules in client.py: {e}", file=sys.stderr)
     # Add more detailed error logging if possible
     sys.exit(1)
 
-
-def setup_logging(self):
-        """Configure logging for the client."""
-        # Create a logger for this client
-        self.logging = logging.getLogger(f"client.{self.client_id}")
-        self.logging.setLevel(logging.INFO)
-        
-        # Create a file handler
-        log_dir = os.path.join(os.getcwd(), "logs")
-        os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, f"client_{self.client_id}.log")
-        file_handler = logging.FileHandler(log_file)
-        
-        # Set formatter
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-        file_handler.setFormatter(formatter)
-        
-        # Add handlers to logger
-        self.logging.handlers = []  # Remove any existing handlers
-        self.logging.addHandler(file_handler)  # Only add file handler, no stream handler
+# Event/message names resolved once; Enum .value lookups are not free on hot paths
+PERFORM_OCR_REQUEST = MessageType.PERFORM_OCR_REQUEST.value
+CLIENT_COUNT = MessageType.CLIENT_COUNT.value
+OCR_RESULT = MessageType.OCR_RESULT.value
+OCR_ERROR = MessageType.OCR_ERROR.value
+SERVER_STARTED = EventType.SERVER_STARTED.value
+CLIENT_CONNECTED = EventType.CLIENT_CONNECTED.value
+CLIENT_DISCONNECTED = EventType.CLIENT_DISCONNECTED.value
+CLIENT_JOINED_ROOM = EventType.CLIENT_JOINED_ROOM.value
+CLIENT_LEFT_ROOM = EventType.CLIENT_LEFT_ROOM.value
+UPDATED_CLIENT_COUNT = EventType.UPDATED_CLIENT_COUNT.value
+OCR_PROCESSING_STARTED = EventType.OCR_PROCESSING_STARTED.value
+OCR_PROCESSING_COMPLETED = EventType.OCR_PROCESSING_COMPLETED.value
+PROCESSED_SCREENSHOT = EventType.PROCESSED_SCREENSHOT.value
+
+# Log directory, resolved and created once at import rather than per setup_logging call
+_LOG_DIR = Path.cwd() / "logs"
+_LOG_DIR.mkdir(exist_ok=True)
+
+# Pending OCR requests; when full the oldest request is dropped
+OCR_QUEUE_SIZE = 8
+
+# Number of distinct screenshots whose OCR text is kept in memory
+OCR_CACHE_SIZE = 128
+
+# Log-only server events: event name -> (%-style template, payload keys).
+# Keys of None log the whole payload. Formatting is left to the logging
+# module so filtered records cost nothing beyond the level check.
+EVENT_LOG_TEMPLATES = {
+    SERVER_STARTED: ("Server Started", ()),
+    CLIENT_CONNECTED: ("Client Connected - SID: %s, Type: %s", ("sid", "client_type")),
+    CLIENT_DISCONNECTED: ("Client Disconnected - SID: %s", ("sid",)),
+    CLIENT_JOINED_ROOM: ("Client Joined Room - SID: %s, Room: %s", ("sid", "room")),
+    CLIENT_LEFT_ROOM: ("Client Left Room - SID: %s, Room: %s", ("sid", "room")),
+    UPDATED_CLIENT_COUNT: ("Updated Client Count - Payload: %s", None),
+    OCR_PROCESSING_STARTED: ("OCR Processing Started - Requester: %s", ("requester_sid",)),
+}
+
+# Events with a dedicated handler; anything else reaches catch_all as unhandled
+HANDLED_EVENTS = frozenset({
+    'connect', 'disconnect', 'message',
+    PERFORM_OCR_REQUEST, OCR_PROCESSING_COMPLETED, PROCESSED_SCREENSHOT,
+    *EVENT_LOG_TEMPLATES,
+})
+
+
+def setup_logging(log_level="INFO"):
+    """Configure logging for the client.
+
+    Records are only enqueued on the calling (Socket.IO) thread; a
+    QueueListener thread hands them to a MemoryHandler that batches writes
+    to logs/client.log and flushes straight away on WARNING and above.
+    Returns (logger, listener); stop the listener on shutdown.
+    Idempotent: while our queue handler is installed it is reused rather
+    than opening client.log again.
+    """
+    logger = logging.getLogger("Threethreeter-Client")
+    logger.setLevel(getattr(logging, str(log_level).upper(), logging.INFO))
+
+    for handler in logger.handlers:
+        if getattr(handler, '_ttr_client_handler', False):
+            return logger, handler._ttr_listener
+
+    # Create a file handler
+    file_handler = logging.FileHandler(_LOG_DIR / "client.log")
+
+    # Set formatter
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    file_handler.setFormatter(formatter)
+
+    # Coalesce writes to disk; warnings and errors flush immediately, so the
+    # lines leading up to a crash are on disk rather than in the buffer
+    memory_handler = logging.handlers.MemoryHandler(
+        capacity=1024, flushLevel=logging.WARNING, target=file_handler
+    )
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, memory_handler, respect_handler_level=True)
+
+    # Add handlers to logger; only the queue, no stream handler. The marker
+    # lets later calls find it without touching handlers added elsewhere
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler._ttr_client_handler = True
+    queue_handler._ttr_listener = listener
+    logger.addHandler(queue_handler)
+    listener.start()
+    return logger, listener
 
 class ScreenshotClient:
     def __init__(self):
         # Load configuration using ConfigManager
         self.config = config_manager.config # Get config dict
         log_level = config_manager.get('server', 'log_level', default='INFO')
-        self.logger = setup_logging(log_level)
-
-        # Initialize Socket.IO client with reduced logging
-        self.sio = socketio.Client(logger=False, engineio_logger=False)
+        self.logger, self._log_listener = setup_logging(log_level)
+
+        # Reconnect/backoff tuning (seconds), shared by the initial connect loop
+        # and socketio's own automatic reconnection after a drop
+        self.reconnect_attempts = max(1, int(config_manager.get('server', 'reconnect_attempts', default=5)))
+        self.reconnect_delay = float(config_manager.get('server', 'reconnect_delay', default=1.0))
+        self.reconnect_delay_max = float(config_manager.get('server', 'reconnect_delay_max', default=60.0))
+
+        # Initialize Socket.IO client with reduced logging. Automatic
+        # reconnection retries forever with jittered exponential backoff.
+        self.sio = socketio.Client(
+            logger=False,
+            engineio_logger=False,
+            reconnection=True,
+            reconnection_attempts=0,
+            reconnection_delay=self.reconnect_delay,
+            reconnection_delay_max=self.reconnect_delay_max,
+            randomization_factor=0.5,
+            json=socketio_json
+        )
         self.setup_handlers()
 
-        # Initialize OCR Processor (used for processing)
-        self.ocr_processor = OCRProcessor()
+        # OCR Processor (pulls in PIL/pytesseract) is created on first use, see ocr_processor
+        self._ocr_processor = None
+        # LRU of OCR text keyed by a digest of the screenshot file's bytes
+        self._ocr_cache = OrderedDict()
+        # Digest and text of the most recently OCRed image, checked before the LRU
+        self._last_img_hash = None
+        self._last_ocr_text = None
+        # Guards the LRU and last-image fields; Tesseract itself runs outside it
+        self._ocr_lock = threading.Lock()
+        # OCR requests are run one at a time by a background task so that the
+        # Socket.IO thread is never blocked behind Tesseract
+        self._ocr_q = queue.Queue(maxsize=OCR_QUEUE_SIZE)
+        self._ocr_thread = self.sio.start_background_task(self._ocr_worker)
         # ScreenshotManager might not be needed directly if OCRProcessor handles capture,
         # or if capture is triggered differently. Adjust based on actual implementation.
         # self.screenshot_manager = ScreenshotManager() # Remove if OCRProcessor handles capture
 
+    @property
+    def ocr_processor(self):
+        """OCR processor, imported and constructed on the first OCR request."""
+        if self._ocr_processor is None:
+            from .ocr_processor import OCRProcessor
+            self._ocr_processor = OCRProcessor()
+        return self._ocr_processor
+
     def setup_handlers(self):
         """Set up Socket.IO event handlers."""
         @self.sio.event
@@ -92,96 +199,83 @@ class ScreenshotClient:
         @self.sio.event
         def disconnect():
             #self.logger.info("Disconnected from Socket.IO server")
-            # Stop any ongoing processes if necessary
-            self.screenshot_manager.stop_capturing()
+            # Stop any ongoing processes if necessary (no manager is attached by default)
+            sm = getattr(self, 'screenshot_manager', None)
+            if sm is not None:
+                sm.stop_capturing()
 
         @self.sio.event
         def connect_error(data):
-            self.logger.error(f"Connection failed: {data}")
+            self.logger.error("Connection failed: %s", data)
             pass
 
         # --- Message Handlers ---
 
         # Handle request from server to perform OCR
-        @self.sio.on(MessageType.PERFORM_OCR_REQUEST.value)
+        @self.sio.on(PERFORM_OCR_REQUEST)
         def on_perform_ocr_request(data):
             requester_sid = data.get('requester_sid')
             if not requester_sid:
-                self.logger.error(f"Received '{MessageType.PERFORM_OCR_REQUEST.value}' without requester_sid.")
+                self.logger.error("Received '%s' without requester_sid.", PERFORM_OCR_REQUEST)
                 return
             #self.logger.info(f"Received OCR request from server for requester: {requester_sid}")
-            # Call processing function, passing the requester_sid
-            self.process_latest_screenshot(requester_sid=requester_sid)
+            # Hand off to the OCR worker, passing the requester_sid
+            self._enqueue_ocr_request(requester_sid)
 
         # Handle generic messages (e.g., INFO, WARNING from server)
         @self.sio.on('message')
         def on_message(data):
-            msg_type = data.get('messageType')
-            msg_value = data.get('value')
-            msg_from = data.get('from')
-            #self.logger.info(f"Received message from {msg_from}: Type={msg_type}, Value='{str(msg_value)[:100]}...'")
+            get = data.get  # Bound once; this runs for every chat message
+            msg_type = get('messageType')
+            if msg_type is None:
+                return
+            #self.logger.info(f"Received message from {get('from')}: Type={msg_type}, Value='{str(get('value'))[:100]}...'")
             # Add specific handling if needed (e.g., for CLIENT_COUNT message)
-            if msg_type == MessageType.CLIENT_COUNT.value:
-                 count = msg_value.get('count', '?')
+            if msg_type == CLIENT_COUNT:
+                 count = (get('value') or {}).get('count', '?')
                  #self.logger.info(f"Current iOS client count from server: {count}")
 
 
         # --- Event Handlers (for logging/awareness) ---
         # Use @self.sio.event for built-in events, @self.sio.on for custom ones
 
-        @self.sio.on(EventType.SERVER_STARTED.value)
-        def on_server_started(data):
-            self.logger.info("Received event: Server Started")
-
-        @self.sio.on(EventType.CLIENT_CONNECTED.value)
-        def on_client_connected(data):
-            self.logger.info(f"Received event: Client Connected - SID: {data.get('sid')}, Type: {data.get('client_type')}")
-
-        @self.sio.on(EventType.CLIENT_DISCONNECTED.value)
-        def on_client_disconnected(data):
-            self.logger.info(f"Received event: Client Disconnected - SID: {data.get('sid')}")
-
-        @self.sio.on(EventType.CLIENT_JOINED_ROOM.value)
-        def on_client_joined(data):
-            self.logger.info(f"Received event: Client Joined Room - SID: {data.get('sid')}, Room: {data.get('room')}")
-
-        @self.sio.on(EventType.CLIENT_LEFT_ROOM.value)
-        def on_client_left(data):
-            self.logger.info(f"Received event: Client Left Room - SID: {data.get('sid')}, Room: {data.get('room')}")
-
-        @self.sio.on(EventType.UPDATED_CLIENT_COUNT.value)
-        def on_client_count_event(data):
-             # Log the event payload directly
-             self.logger.info(f"Received event: Updated Client Count - Payload: {data}")
-
-        @self.sio.on(EventType.OCR_PROCESSING_STARTED.value)
-        def on_ocr_started(data):
-            self.logger.info(f"Received event: OCR Processing Started - Requester: {data.get('requester_sid')}")
+        for event_name in EVENT_LOG_TEMPLATES:
+            self.sio.on(event_name, functools.partial(self._log_event, event_name))
 
-        @self.sio.on(EventType.OCR_PROCESSING_COMPLETED.value)
+        @self.sio.on(OCR_PROCESSING_COMPLETED)
         def on_ocr_completed(data):
+            # Status is derived from the payload, so this one can't use a plain template
+            if not self.logger.isEnabledFor(logging.INFO):
+                return
             status = "Success" if data.get('success') else f"Failed ({data.get('error', 'Unknown')})"
-            self.logger.info(f"Received event: OCR Processing Completed - Requester: {data.get('requester_sid')}, Status: {status}")
+            self.logger.info("Received event: OCR Processing Completed - Requester: %s, Status: %s", data.get('requester_sid'), status)
 
-        @self.sio.on(EventType.PROCESSED_SCREENSHOT.value)
+        @self.sio.on(PROCESSED_SCREENSHOT)
         def on_screenshot_processed(data):
-             status = "Success" if data.get('success') else f"Failed ({data.get('error', 'Unknown')})"
-             preview = data.get('text_preview', '')
+             # Registered so it isn't reported as unhandled; nothing to do with it here
              #self.logger.info(f"Received event: Processed Screenshot - Status: {status}, Preview: '{preview}'")
+             pass
 
         # Catch-all for unhandled events (optional)
         @self.sio.on('*')
         def catch_all(event, data):
             # Avoid logging standard connect/disconnect/message here as they have specific handlers
-            if event not in ['connect', 'disconnect', 'message',
-                             MessageType.PERFORM_OCR_REQUEST.value, # Handled above
-                             EventType.SERVER_STARTED.value, EventType.CLIENT_CONNECTED.value, # etc...
-                             EventType.CLIENT_DISCONNECTED.value, EventType.CLIENT_JOINED_ROOM.value,
-                             EventType.CLIENT_LEFT_ROOM.value, EventType.UPDATED_CLIENT_COUNT.value,
-                             EventType.OCR_PROCESSING_STARTED.value, EventType.OCR_PROCESSING_COMPLETED.value,
-                             EventType.PROCESSED_SCREENSHOT.value]:
-                 self.logger.debug(f"Received unhandled event '{event}': {str(data)[:200]}")
-
+            # Skip the repr of data entirely unless DEBUG records are emitted
+            if event not in HANDLED_EVENTS and self.logger.isEnabledFor(logging.DEBUG):
+                 self.logger.debug("Received unhandled event '%s': %.200s", event, data)
+
+
+    def _log_event(self, event_name, data):
+        """Log a server event using its template from EVENT_LOG_TEMPLATES."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        template, keys = EVENT_LOG_TEMPLATES[event_name]
+        if keys is None:
+            args = (data,)
+        else:
+            payload = data if isinstance(data, dict) else {}
+            args = tuple(payload.get(key) for key in keys)
+        self.logger.info("Received event: " + template, *args)
 
     def register_as_internal_client(self):
         """Register this client as an internal client on the server."""
@@ -192,46 +286,112 @@ class ScreenshotClient:
         host = config_manager.get('server', 'host', default='localhost')
         port = config_manager.get('server', 'port', default=5348)
         server_url = f"http://{host}:{port}"
-        self.logger.info(f"Attempting to connect to server at {server_url}")
+        self.logger.info("Attempting to connect to server at %s", server_url)
+        # Set user agent to identify as Python client
+        headers = {
+            'User-Agent': 'Python/Threethreeter-Client'
+        }
+        # Add auth dictionary if needed by server
+        auth = {'client_type': 'Internal'}
+        for attempt in range(self.reconnect_attempts):
+            try:
+                # Websocket only: no long-polling fallback/upgrade round trips
+                self.sio.connect(server_url, headers=headers, auth=auth, transports=['websocket'])
+                return True
+            except socketio.exceptions.ConnectionError as e:
+                if attempt + 1 >= self.reconnect_attempts:
+                    self.logger.error("Failed to connect to server after %d attempts: %s", self.reconnect_attempts, e)
+                    return False
+                # Exponential backoff with jitter so a down server isn't hammered
+                delay = min(self.reconnect_delay_max, self.reconnect_delay * 2 ** attempt) * random.uniform(0.5, 1.5)
+                self.logger.warning("Failed to connect to server (attempt %d/%d): %s. Retrying in %.1fs", attempt + 1, self.reconnect_attempts, e, delay)
+                time.sleep(delay)
+            except Exception as e:
+                self.logger.error("An unexpected error occurred during connection: %s", e, exc_info=True)
+                return False
+        return False
+
+    def _ocr_latest_screenshot(self):
+        """Return OCR text for the latest screenshot, reusing cached text for identical images."""
+        latest = self.ocr_processor.get_latest_screenshot()
         try:
-            # Set user agent to identify as Python client
-            headers = {
-                'User-Agent': 'Python/Threethreeter-Client'
-            }
-            # Add auth dictionary if needed by server
-            auth = {'client_type': 'Internal'}
-            self.sio.connect(server_url, headers=headers, auth=auth, transports=['websocket']) # Prefer websocket
-            return True
-        except socketio.exceptions.ConnectionError as e:
-            self.logger.error(f"Failed to connect to server: {e}")
-            return False
-        except Exception as e:
-            self.logger.error(f"An unexpected error occurred during connection: {e}", exc_info=True)
-            return False
+            with open(latest, 'rb') as f:
+                key = hashlib.blake2b(f.read(), digest_size=16).digest()
+        except (TypeError, OSError):
+            # No image bytes to key on; run OCR uncached
+            return self.ocr_processor.process_latest_screenshot()
+
+        with self._ocr_lock:
+            # Fast path: the screen hasn't changed since the last request
+            if key == self._last_img_hash and self._last_ocr_text is not None:
+                self.logger.debug("Screenshot unchanged since last OCR (%s)", latest)
+                return self._last_ocr_text
+
+            text = self._ocr_cache.get(key)
+            if text is not None:
+                self._ocr_cache.move_to_end(key)
+                self.logger.debug("OCR cache hit for %s", latest)
+                self._last_img_hash = key
+                self._last_ocr_text = text
+                return text
+
+        text = self.ocr_processor.process_image(latest)
+        if not text:  # Failures are not cached so they can be retried
+            return text
+        with self._ocr_lock:
+            self._ocr_cache[key] = text
+            if len(self._ocr_cache) > OCR_CACHE_SIZE:
+                self._ocr_cache.popitem(last=False)
+            self._last_img_hash = key
+            self._last_ocr_text = text
+        return text
+
+    def _enqueue_ocr_request(self, requester_sid):
+        """Queue an OCR request for the worker, dropping the oldest one if the queue is full."""
+        while True:
+            try:
+                self._ocr_q.put_nowait(requester_sid)
+                return
+            except queue.Full:
+                try:
+                    dropped = self._ocr_q.get_nowait()
+                    self._ocr_q.task_done()
+                    self.logger.warning("OCR queue full, dropped request from %s", dropped)
+                except queue.Empty:
+                    pass
+
+    def _ocr_worker(self):
+        """Run queued OCR requests in arrival order."""
+        while True:
+            requester_sid = self._ocr_q.get()
+            try:
+                self.process_latest_screenshot(requester_sid=requester_sid)
+            except Exception as e:
+                self.logger.error("Unexpected error in OCR worker: %s", e, exc_info=True)
+            finally:
+                self._ocr_q.task_done()
 
     # Modified to accept requester_sid and send result/error back to server
     def process_latest_screenshot(self, requester_sid: str):
         """Process the latest screenshot and send results or errors back to the server."""
         #self.logger.info(f"Processing latest screenshot for requester: {requester_sid}")
         try:
-            # Use OCRProcessor instance to get the text
-            result = self.ocr_processor.process_latest_screenshot()
+            # Use OCRProcessor instance to get the text (cached per image)
+            result = self._ocr_latest_screenshot()
 
             if result:
                 #self.logger.info(f"OCR successful. Sending result back to server for {requester_sid}.")
-                payload = {
-                    'requester_sid': requester_sid,
-                    'text': result
-                }
-                self.sio.emit(MessageType.OCR_RESULT.value, payload)
+                # Compressed when large, see create_internal_ocr_result_payload
+                payload = create_internal_ocr_result_payload(requester_sid, result)
+                self.sio.emit(OCR_RESULT, payload)
             else:
                 error_msg = "OCR processing returned no text."
-                self.logger.warning(f"{error_msg} Sending error back to server for {requester_sid}.")
+                self.logger.warning("%s Sending error back to server for %s.", error_msg, requester_sid)
                 payload = {
                     'requester_sid': requester_sid,
                     'error': error_msg
                 }
-                self.sio.emit(MessageType.OCR_ERROR.value, payload)
+                self.sio.emit(OCR_ERROR, payload)
 
         except Exception as e:
             error_msg = f"Error during OCR processing: {str(e)}"
@@ -242,7 +402,7 @@ class ScreenshotClient:
                 'error': error_msg
             }
             try:
-                self.sio.emit(MessageType.OCR_ERROR.value, payload)
+                self.sio.emit(OCR_ERROR, payload)
             except Exception as emit_e:
                  #self.logger.error(f"Failed to emit OCR error back to server: {emit_e}")
                  pass
@@ -252,11 +412,29 @@ class ScreenshotClient:
         """Disconnect from the Socket.IO server."""
         if self.sio and self.sio.connected:
             self.logger.info("Disconnecting from server...")
-            # self.screenshot_manager.stop_capturing() # Remove if not used
+            sm = getattr(self, 'screenshot_manager', None)
+            if sm is not None:
+                sm.stop_capturing()
             self.sio.disconnect()
             self.logger.info("Disconnected.")
         else:
             self.logger.info("Already disconnected or client not initialized.")
+        self._stop_logging()
+
+    def _stop_logging(self):
+        """Drain the log queue, flush buffered records to disk and release client.log."""
+        if self._log_listener is None:
+            return
+        for handler in list(self.logger.handlers):
+            if getattr(handler, '_ttr_listener', None) is self._log_listener:
+                self.logger.removeHandler(handler)
+        self._log_listener.stop()
+        for handler in self._log_listener.handlers:
+            target = handler.target  # MemoryHandler.close() flushes then drops it
+            handler.close()
+            if target is not None:
+                target.close()
+        self._log_listener = None
 
 def main():
     """Main entry point."""
@@ -279,12 +457,12 @@ def main():
         except KeyboardInterrupt:
             client.logger.info("Shutdown requested by user")
         except Exception as loop_e:
-             client.logger.error(f"Error during client wait loop: {loop_e}", exc_info=True)
+             client.logger.error("Error during client wait loop: %s", loop_e, exc_info=True)
 
     except Exception as e:
         # Use logger if available, otherwise print
         if client and client.logger:
-            client.logger.critical(f"Client failed to start or run: {e}", exc_info=True)
+            client.logger.critical("Client failed to start or run: %s", e, exc_info=True)
         else:
             print(f"Critical Error: {e}", file=sys.stderr)
             import traceback
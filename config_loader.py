@@ -22,17 +22,57 @@ Key Features:
 - Add configuration backup and restore functionality
 """
 import os
+import copy
 import json
 import logging
-from typing import Any, Dict, Optional
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
 from .path_config import get_config_dir
 
+try:
+    # Optional: orjson parses/serializes config several times faster than json
+    import orjson
+    _loads = orjson.loads
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _loads = json.loads
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, indent=2).encode()
+
+# Structural schemas for the config files. Value coercion (port to int,
+# frequency range) is still done by the _validate_* methods.
+SERVER_SCHEMA = {
+    "type": "object",
+    "required": ["server"],
+    "properties": {
+        "server": {"type": "object", "required": ["host", "port"]}
+    }
+}
+FREQUENCY_SCHEMA = {
+    "type": "object",
+    "required": ["frequency", "min_frequency", "max_frequency", "max_age"]
+}
+
+try:
+    # Optional: fastjsonschema compiles the schemas to Python code once at import
+    import fastjsonschema
+    _validate_server_schema = fastjsonschema.compile(SERVER_SCHEMA)
+    _validate_frequency_schema = fastjsonschema.compile(FREQUENCY_SCHEMA)
+except ImportError:
+    fastjsonschema = None
+    _validate_server_schema = None
+    _validate_frequency_schema = None
+
 class ConfigManager:
     def __init__(self):
         """Initialize the configuration manager."""
         self._config: Dict[str, Any] = {}
+        self._config_dir = get_config_dir()
         self._load_defaults()
         self._load_config_files()
+        # Live read-only view handed out by config/get_config; see snapshot() for a copy
+        self._view = MappingProxyType(self._config)
     
     def _load_defaults(self) -> None:
         """Load default configuration values."""
@@ -64,11 +104,11 @@ class ConfigManager:
         ]
         
         for filename in config_files:
-            filepath = os.path.join(get_config_dir(), filename)
+            filepath = os.path.join(self._config_dir, filename)
             try:
                 if os.path.exists(filepath):
-                    with open(filepath, 'r') as f:
-                        file_config = json.load(f)
+                    with open(filepath, 'rb') as f:
+                        file_config = _loads(f.read())
                         # Merge configuration recursively
                         self._merge_config(self._config, file_config)
                         self._validate_config(filename, file_config)
@@ -77,20 +117,22 @@ class ConfigManager:
     
     def _merge_config(self, base: Dict, update: Dict) -> None:
         """
-        Recursively merge two configuration dictionaries.
+        Deep-merge update into base, in place.
+        Nested dicts are walked with an explicit stack rather than recursion.
         Args:
             base: Base configuration dictionary
             update: Dictionary with updates to merge
         """
-        for key, value in update.items():
-            if (
-                key in base and 
-                isinstance(base[key], dict) and 
-                isinstance(value, dict)
-            ):
-                self._merge_config(base[key], value)
-            else:
-                base[key] = value
+        stack = [(base, update)]
+        while stack:
+            base_dict, update_dict = stack.pop()
+            for key, value in update_dict.items():
+                base_value = base_dict.get(key)
+                # Config is parsed JSON, so plain dicts are all we need to handle
+                if type(base_value) is dict and type(value) is dict:
+                    stack.append((base_value, value))
+                else:
+                    base_dict[key] = value
     
     def _validate_config(self, filename: str, config: Dict[str, Any]) -> None:
         """Validate configuration based on the filename."""
@@ -101,9 +143,15 @@ class ConfigManager:
     
     def _validate_frequency_config(self, config: Dict[str, Any]) -> None:
         """Validate screenshot frequency configuration"""
-        required = {"frequency", "min_frequency", "max_frequency", "max_age"}
-        if not all(k in config for k in required):
-            raise ValueError(f"Missing required frequency config keys: {required}")
+        if _validate_frequency_schema is not None:
+            try:
+                _validate_frequency_schema(config)
+            except fastjsonschema.JsonSchemaException as e:
+                raise ValueError(f"Invalid frequency config: {e}") from e
+        else:
+            required = {"frequency", "min_frequency", "max_frequency", "max_age"}
+            if not all(k in config for k in required):
+                raise ValueError(f"Missing required frequency config keys: {required}")
             
         # Handle the case where frequency is None or not a number
         frequency = config.get("frequency")
@@ -122,13 +170,19 @@ class ConfigManager:
     
     def _validate_server_config(self, config: Dict[str, Any]) -> None:
         """Validate server configuration"""
-        if 'server' not in config:
-            raise ValueError("Missing 'server' section in server_config.json")
+        if _validate_server_schema is not None:
+            try:
+                _validate_server_schema(config)
+            except fastjsonschema.JsonSchemaException as e:
+                raise ValueError(f"Invalid server_config.json: {e}") from e
+        else:
+            if 'server' not in config:
+                raise ValueError("Missing 'server' section in server_config.json")
+            required = {"host", "port"}
+            if not all(k in config['server'] for k in required):
+                raise ValueError(f"Missing required server config keys under 'server': {required - set(config['server'].keys())}")
         
         server_config = config['server']
-        required = {"host", "port"}
-        if not all(k in server_config for k in required):
-            raise ValueError(f"Missing required server config keys under 'server': {required - set(server_config.keys())}")
             
         port = server_config.get("port")
         if port is None:
@@ -163,9 +217,13 @@ class ConfigManager:
             # Return default if section or key doesn't exist
             return default
     
-    def get_config(self) -> Dict[str, Any]:
-        """Get the complete configuration dictionary."""
-        return self._config.copy()
+    def get_config(self) -> Mapping[str, Any]:
+        """Get a read-only view of the complete configuration."""
+        return self._view
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get an independent deep copy of the configuration."""
+        return copy.deepcopy(self._config)
     
     def set(self, section: str, key: str, value: Any) -> None:
         """
@@ -188,20 +246,20 @@ class ConfigManager:
             bool: True if save was successful, False otherwise
         """
         try:
-            filepath = os.path.join(get_config_dir(), filename)
+            filepath = os.path.join(self._config_dir, filename)
             os.makedirs(os.path.dirname(filepath), exist_ok=True)
             
-            with open(filepath, 'w') as f:
-                json.dump(self._config, f, indent=2)
+            with open(filepath, 'wb') as f:
+                f.write(_dumps(self._config))
             return True
         except Exception as e:
             logging.error(f"Error saving config to {filename}: {e}")
             return False
     
     @property
-    def config(self) -> Dict[str, Any]:
-        """Get the complete configuration dictionary."""
-        return self._config.copy()
+    def config(self) -> Mapping[str, Any]:
+        """Get a read-only view of the complete configuration."""
+        return self._view
 
 # Create a global configuration instance
 config = ConfigManager()
\ No newline at end of file
@@ -4,7 +4,7 @@ import logging
 # Direct imports
 from .base_view import BaseView
 from .color_scheme import *
-from .message_system import MessageManager, MessageLevel, MessageCategory
+from .message_system import MessageManager, MessageLevel, MessageCategory, BufferID
 
 # Get a logger instance for this module
 logger = logging.getLogger(__name__)
@@ -244,12 +244,13 @@ class DebugView(BaseView):
         curses.curs_set(0) # Hide cursor again
         del win
         self.stdscr.touchwin() # Make sure main screen is refreshed
-        self.stdscr.refresh()
+        self.stdscr.noutrefresh() # Flushed by the next frame's doupdate()
+        self.invalidate()
 
     def clear_messages(self):
         """Clear the debug message buffer."""
         # Clear using MessageManager
-        self.process_manager.message_manager.clear_buffer("debug")  # Use process_manager's instance
+        self.process_manager.message_manager.clear_buffer(BufferID.DEBUG)  # Use process_manager's instance
         self.scroll_pos = 0  # Reset scroll position
         # Add message via manager
         self.process_manager.message_manager.add_message(
@@ -257,7 +258,7 @@ class DebugView(BaseView):
             level=MessageLevel.INFO,
             category=MessageCategory.SYSTEM,
             source="ui_action",
-            buffer_name="debug"
+            buffer_name=BufferID.DEBUG
         )
 
     def get_help_content(self) -> list[tuple[str, str]]:
@@ -0,0 +1,30 @@
+"""Logging helpers shared by the Threethreeter modules."""
+
+import queue
+import atexit
+import logging
+import logging.handlers
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def attach_queued_file_handler(logger: logging.Logger, log_file, level: int = logging.NOTSET,
+                               stop_at_exit: bool = True) -> logging.handlers.QueueListener:
+    """Log to log_file without writing on the caller's thread.
+
+    The logger only gets a QueueHandler, so logging a record is an enqueue;
+    a QueueListener thread formats it and writes the file. Returns the
+    listener; unless stop_at_exit is False it is stopped at exit so queued
+    records are flushed (stop() must only be called once).
+    """
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setLevel(level)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    if stop_at_exit:
+        atexit.register(listener.stop)
+    return listener
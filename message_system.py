@@ -4,12 +4,29 @@ This module provides a centralized messaging system with structured message
 representation, thread-safe buffering, and consistent formatting for UI display.
 """
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
-from enum import Enum
+from typing import Callable, Dict, List, Optional, Any, Union
+from enum import Enum, IntEnum
+import re
 import time
+import heapq
+import logging
 import threading
+import itertools
 from collections import deque
 
+try:
+    # Optional: orjson serializes in C, several times faster than json
+    import orjson
+    def _json_dumps(obj: Dict[str, Any]) -> str:
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    import json
+    def _json_dumps(obj: Dict[str, Any]) -> str:
+        return json.dumps(obj, default=str, ensure_ascii=False)
+
+
+logger = logging.getLogger(__name__)
+
 
 class MessageLevel(Enum):
     """Message severity levels."""
@@ -29,90 +46,140 @@ class MessageCategory(Enum):
     OCR = "ocr"
 
 
-@dataclass
+# (second, "HH:MM:SS") of the last formatted timestamp; bursts of messages
+# within the same second share one strftime. Swapped as a whole tuple so
+# concurrent callers never see a mismatched pair
+_clock_cache = (None, "")
+
+
+def _format_clock(timestamp: float) -> str:
+    """Format an epoch timestamp as local HH:MM:SS."""
+    global _clock_cache
+    sec = int(timestamp)
+    cached_sec, text = _clock_cache
+    if sec != cached_sec:
+        text = time.strftime("%H:%M:%S", time.localtime(sec))
+        _clock_cache = (sec, text)
+    return text
+
+
+# Emoji lookup tables for Message.emoji. Categories take precedence over levels;
+# keyword tables are checked in order against the lowercased content.
+_CATEGORY_KEYWORD_EMOJI = {
+    MessageCategory.SOCKET: ((("sending", "📤"), ("received", "📥")), "📱"),
+    MessageCategory.SCREENSHOT: ((("captured", "📸"), ("deleted", "🗑️")), "🖼️"),
+}
+_CATEGORY_EMOJI = {
+    MessageCategory.OCR: "📝",
+}
+_LEVEL_EMOJI = {
+    MessageLevel.ERROR: "❌",
+    MessageLevel.WARNING: "⚠️",
+    MessageLevel.INFO: "ℹ️",
+    MessageLevel.CODESOLUTION: "✨",
+    MessageLevel.DEBUG: "🔍",
+}
+_DEFAULT_EMOJI = "📱"
+
+
+@dataclass(slots=True)
 class Message:
-    """Structured message for the Threethreeter application."""
+    """Structured message for the Threethreeter application.
+
+    Slotted (no per-instance __dict__) since buffers hold thousands of these.
+    """
     timestamp: float = field(default_factory=time.time)
     level: MessageLevel = MessageLevel.INFO
     category: MessageCategory = MessageCategory.SYSTEM
     content: str = ""
     source: str = "system"
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    metadata: Optional[Dict[str, Any]] = None  # None rather than an empty dict per message
+    # Computed on first access; messages are not modified after creation
+    _emoji: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _fmt_ts: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     @property
     def formatted_timestamp(self) -> str:
         """Get formatted timestamp string."""
-        return time.strftime("%H:%M:%S", time.localtime(self.timestamp))
+        if self._fmt_ts is None:
+            self._fmt_ts = _format_clock(self.timestamp)
+        return self._fmt_ts
     
     @property
     def emoji(self) -> str:
         """Get appropriate emoji based on message properties."""
+        if self._emoji is None:
+            self._emoji = self._compute_emoji()
+        return self._emoji
+    
+    def _compute_emoji(self) -> str:
+        """Look up the emoji for this message's category, content and level."""
         # Category-based emojis
-        if self.category == MessageCategory.SOCKET:
-            if "sending" in self.content.lower():
-                return "📤"
-            elif "received" in self.content.lower():
-                return "📥"
-            return "📱"
-        elif self.category == MessageCategory.SCREENSHOT:
-            if "captured" in self.content.lower():
-                return "📸"
-            elif "deleted" in self.content.lower():
-                return "🗑️"
-            return "🖼️"
-        elif self.category == MessageCategory.OCR:
-            return "📝"
+        keyword_entry = _CATEGORY_KEYWORD_EMOJI.get(self.category)
+        if keyword_entry is not None:
+            keywords, fallback = keyword_entry
+            content_lower = self.content.lower()
+            for keyword, emoji in keywords:
+                if keyword in content_lower:
+                    return emoji
+            return fallback
+        emoji = _CATEGORY_EMOJI.get(self.category)
+        if emoji is not None:
+            return emoji
             
         # Level-based emojis
-        if self.level == MessageLevel.ERROR:
-            return "❌"
-        elif self.level == MessageLevel.WARNING:
-            return "⚠️"
-        elif self.level == MessageLevel.INFO:
-            return "ℹ️"
-        elif self.level == MessageLevel.CODESOLUTION:
-            return "✨"
-        elif self.level == MessageLevel.DEBUG:
-            return "🔍"
-            
-        return "📱"  # Default
+        return _LEVEL_EMOJI.get(self.level, _DEFAULT_EMOJI)
 
 
 class MessageBuffer:
-    """Thread-safe buffer for storing and retrieving messages."""
+    """Thread-safe buffer for storing and retrieving messages.
+
+    Writers (add, clear) serialize on the lock. Readers take no lock: they
+    copy the deque in one C-level call, atomic w.r.t. appends.
+    """
     def __init__(self, max_size: int = 1000):
+        self.max_size = max_size
         self.buffer = deque(maxlen=max_size)
-        self.lock = threading.RLock()
+        # Writers hold this so each change and its version bump land together:
+        # unlocked, two racing add()s can lose a "+= 1" and a cached MAIN view
+        # would look current while missing a message
+        self.lock = threading.Lock()
+        # Bumped on every change, so readers can tell a cached view is stale
+        self.version = 0
         
     def add(self, message: Message) -> None:
         """Add a message to the buffer."""
         with self.lock:
             self.buffer.append(message)
+            self.version += 1
     
     def get_all(self) -> List[Message]:
-        """Get all messages in the buffer."""
-        with self.lock:
-            return list(self.buffer)
+        """Get all messages in the buffer (snapshot, no lock)."""
+        return list(self.buffer)
     
     def get_by_category(self, category: MessageCategory) -> List[Message]:
-        """Get messages filtered by category."""
-        with self.lock:
-            return [msg for msg in self.buffer if msg.category == category]
+        """Get messages filtered by category (snapshot, no lock)."""
+        return [msg for msg in self.get_all() if msg.category is category]
     
     def get_by_level(self, level: MessageLevel) -> List[Message]:
-        """Get messages filtered by level."""
-        with self.lock:
-            return [msg for msg in self.buffer if msg.level == level]
+        """Get messages filtered by level (snapshot, no lock)."""
+        return [msg for msg in self.get_all() if msg.level is level]
     
     def get_by_source(self, source: str) -> List[Message]:
-        """Get messages filtered by source."""
-        with self.lock:
-            return [msg for msg in self.buffer if msg.source == source]
+        """Get messages filtered by source (snapshot, no lock)."""
+        return [msg for msg in self.get_all() if msg.source == source]
     
     def clear(self) -> None:
         """Clear all messages from the buffer."""
         with self.lock:
             self.buffer.clear()
+            self.version += 1
+
+
+# Output templates for MessageFormatter; %-formatting a constant template
+# avoids rebuilding the f-string pieces per message
+_LOG_TMPL = "[%s] [%s] %s"
+_LEGACY_TMPL = "%s %s %s (%s)"
 
 
 class MessageFormatter:
@@ -133,163 +200,222 @@ class MessageFormatter:
     @staticmethod
     def format_for_log(message: Message) -> str:
         """Format a message for log file."""
-        return f"[{message.formatted_timestamp}] [{message.level.value.upper()}] {message.content}"
+        return _LOG_TMPL % (message.formatted_timestamp, message.level.value.upper(), message.content)
     
     @staticmethod
     def format_legacy(message: Message) -> str:
         """Format a message in the legacy string format for backward compatibility."""
-        timestamp = message.formatted_timestamp
-        emoji = message.emoji
-        content = message.content
-        level = message.level.value
-        return f"{timestamp} {emoji} {content} ({level})"
+        return _LEGACY_TMPL % (message.formatted_timestamp, message.emoji, message.content, message.level.value)
         
     @staticmethod
     def format_json_like(message: Message) -> str:
-        """Format a message in a JSON-like format for debug view."""
-        timestamp = message.formatted_timestamp
-        
-        # For error messages
-        if message.level == MessageLevel.ERROR:
-            return f"{timestamp}: {{\n    ERROR: {message.content}\n}}"
-            
-        # For regular messages
-        metadata = message.metadata
-        msg_type = metadata.get("type", "unknown")
-        msg_value = metadata.get("value", "")
-        msg_from = message.source
-        
-        return f"{timestamp}: {{\n    type: {msg_type},\n    value: {msg_value},\n    from: {msg_from}\n}}"
+        """Format a message as a single-line JSON object for debug view.
+
+        Every level shares one schema; "value" falls back to the message
+        content (e.g. the text of an error) when metadata carries none.
+        """
+        metadata = message.metadata or {}
+        return _json_dumps({
+            "ts": message.formatted_timestamp,
+            "level": message.level.value,
+            "type": metadata.get("type", "unknown"),
+            "value": metadata.get("value", message.content),
+            "from": message.source
+        })
+
+
+# Legacy "timestamp emoji message (level)" lines, parsed in one pass. Mirrors
+# the old split(" ", 2) + rfind parsing: the level runs from the last '(' to
+# the last ')', and any text after that ')' is ignored
+_LEGACY_RE = re.compile(r'([^ ]*) ([^ ]*) (.+)\(([^(]*)\)[^()]*\Z', re.DOTALL)
+_LEVEL_MAP = {level.value: level for level in MessageLevel}
+
+
+class BufferID(IntEnum):
+    """Message buffers, doubling as indexes into MessageManager.buffers."""
+    MAIN = 0
+    SCREENSHOT = 1
+    SOCKET = 2
+    DEBUG = 3
+
+
+# String names accepted for backward compatibility ("main", "screenshot", ...)
+_BUFFER_IDS = {buffer_id.name.lower(): buffer_id for buffer_id in BufferID}
+
+
+def _resolve_buffer(buffer: Union[BufferID, str]) -> Optional[BufferID]:
+    """Map a BufferID or legacy buffer name to a BufferID (None if unknown)."""
+    if type(buffer) is BufferID:
+        return buffer
+    return _BUFFER_IDS.get(buffer)
+
+
+def _message_timestamp(message: Message) -> float:
+    """Sort key for merging buffers in timestamp order."""
+    return message.timestamp
 
 
 class MessageManager:
-    """Central manager for all application messages."""
-    _instance = None
-    _initialized = False
-    
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(MessageManager, cls).__new__(cls)
-        return cls._instance
+    """Central manager for all application messages.
+
+    Each message is stored in one buffer. MAIN is read as a merged view of
+    every buffer (plus messages addressed to MAIN itself).
+
+    Use the shared module-level ``message_manager`` instance rather than
+    constructing new managers.
+    """
     
     def __init__(self):
-        if not self._initialized:
-            self.buffers = {
-                "main": MessageBuffer(),
-                "screenshot": MessageBuffer(),
-                "socket": MessageBuffer(),
-                "debug": MessageBuffer()
-            }
-            self._initialized = True
+        # Indexed by BufferID; methods also accept the legacy string names
+        self.buffers = tuple(MessageBuffer() for _ in BufferID)
+        # (buffer versions, merged messages) of the last MAIN view built;
+        # replaced as one tuple so readers never pair a stamp with other data
+        self._main_cache = (None, [])
+        self._listeners: List[Callable[[], None]] = []
+
+    def add_listener(self, callback: Callable[[], None]) -> None:
+        """Register a callback invoked (with no arguments) whenever a message is added."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]) -> None:
+        """Unregister a callback previously passed to add_listener."""
+        try:
+            self._listeners.remove(callback)
+        except ValueError:
+            pass
     
     def add_message(self, 
                    content: str, 
                    level: MessageLevel = MessageLevel.INFO,
                    category: MessageCategory = MessageCategory.SYSTEM,
                    source: str = "system",
-                   buffer_name: str = "main",
+                   buffer_name: Union[BufferID, str] = BufferID.MAIN,
                    metadata: Optional[Dict[str, Any]] = None) -> Message:
         """
         Add a message to the specified buffer.
         Returns the created message.
         """
-        if metadata is None:
-            metadata = {}
-            
         message = Message(
             content=content,
             level=level,
             category=category,
             source=source,
-            metadata=metadata
+            metadata=metadata or None
         )
+        # Format the timestamp up front so the first UI render doesn't pay for it
+        message.formatted_timestamp
         
-        # Add to specified buffer
-        if buffer_name in self.buffers:
-            self.buffers[buffer_name].add(message)
-        
-        # Always add to main buffer if it's not the target
-        if buffer_name != "main":
-            self.buffers["main"].add(message)
-            
+        # Store once; "main" is read as a merged view of all buffers (see
+        # get_messages), so it only holds messages addressed to it directly
+        self.buffers[_resolve_buffer(buffer_name) or BufferID.MAIN].add(message)
+
+        # Notify listeners (e.g. UI views) that there is something new to draw
+        for callback in tuple(self._listeners):
+            try:
+                callback()
+            except Exception:
+                # A broken listener must not stop the message being stored
+                logger.exception("Message listener %r failed", callback)
+
         return message
     
-    def get_messages(self, buffer_name: str) -> List[Message]:
-        """Get all messages from the specified buffer."""
-        if buffer_name in self.buffers:
-            return self.buffers[buffer_name].get_all()
-        return []
+    def get_messages(self, buffer_name: Union[BufferID, str]) -> List[Message]:
+        """Get all messages from the specified buffer.
+
+        MAIN merges every buffer by timestamp and returns the newest
+        max_size of them. The merged view is cached until a buffer changes.
+        """
+        buffer_id = _resolve_buffer(buffer_name)
+        if buffer_id is None:
+            return []
+        if buffer_id is BufferID.MAIN:
+            # Read before the snapshots: a change in between only makes the
+            # cache look stale, never fresher than it is
+            stamp = tuple(buffer.version for buffer in self.buffers)
+            cached_stamp, merged = self._main_cache
+            if stamp != cached_stamp:
+                merged = self._merge_newest(self.buffers[BufferID.MAIN].max_size)
+                self._main_cache = (stamp, merged)
+            return list(merged)
+        return self.buffers[buffer_id].get_all()
+
+    def _merge_newest(self, limit: int) -> List[Message]:
+        """The newest `limit` messages across all buffers, oldest first."""
+        # Merge newest-first and stop at limit, so older messages are never visited
+        newest = heapq.merge(
+            *(reversed(buffer.get_all()) for buffer in self.buffers),
+            key=_message_timestamp,
+            reverse=True
+        )
+        merged = list(itertools.islice(newest, limit))
+        merged.reverse()
+        return merged
     
-    def get_formatted_messages(self, buffer_name: str, format_type: str = "legacy") -> List[str]:
+    def get_formatted_messages(self, buffer_name: Union[BufferID, str], format_type: str = "legacy") -> List[str]:
         """Get formatted messages from the specified buffer."""
         messages = self.get_messages(buffer_name)
         
         if format_type == "legacy":
-            return [MessageFormatter.format_legacy(msg) for msg in messages]
+            fmt = MessageFormatter.format_legacy
         elif format_type == "json":
-            return [MessageFormatter.format_json_like(msg) for msg in messages]
+            fmt = MessageFormatter.format_json_like
         else:
-            return [MessageFormatter.format_for_curses(msg) for msg in messages]
+            fmt = MessageFormatter.format_for_curses
+        return [fmt(msg) for msg in messages]
     
-    def clear_buffer(self, buffer_name: str) -> None:
-        """Clear a specific message buffer."""
-        if buffer_name in self.buffers:
-            self.buffers[buffer_name].clear()
+    def clear_buffer(self, buffer_name: Union[BufferID, str]) -> None:
+        """Clear a specific message buffer.
 
-    def parse_legacy_message(self, message: str, buffer_name: str = "main"):
+        Clearing MAIN clears every buffer, since MAIN is the merged view of
+        all of them; the other buffers clear only themselves.
+        """
+        buffer_id = _resolve_buffer(buffer_name)
+        if buffer_id is BufferID.MAIN:
+            for buffer in self.buffers:
+                buffer.clear()
+        elif buffer_id is not None:
+            self.buffers[buffer_id].clear()
+
+    def parse_legacy_message(self, message: str, buffer_name: Union[BufferID, str] = BufferID.MAIN):
         """
         Parse a legacy format message string and add it to the system.
         Format expected: "timestamp emoji message (level)"
         """
-        try:
-            parts = message.split(" ", 2)
-            if len(parts) >= 3:
-                timestamp_str = parts[0]
-                emoji = parts[1]
-                rest = parts[2]
-                
-                # Extract level from parentheses at the end
-                level_start = rest.rfind("(")
-                level_end = rest.rfind(")")
-                
-                if level_start > 0 and level_end > level_start:
-                    content = rest[:level_start].strip()
-                    level_str = rest[level_start+1:level_end].strip().lower()
-                    
-                    # Map to MessageLevel
-                    try:
-                        level = MessageLevel(level_str)
-                    except ValueError:
-                        level = MessageLevel.INFO
-                    
-                    # Determine category based on buffer and content
-                    if buffer_name == "screenshot":
-                        category = MessageCategory.SCREENSHOT
-                    elif buffer_name == "debug":
-                        category = MessageCategory.DEBUG
-                    elif "socket" in content.lower():
-                        category = MessageCategory.SOCKET
-                    elif "ocr" in content.lower():
-                        category = MessageCategory.OCR
-                    else:
-                        category = MessageCategory.SYSTEM
-                    
-                    # Add the structured message
-                    return self.add_message(
-                        content=content,
-                        level=level,
-                        category=category,
-                        buffer_name=buffer_name
-                    )
-        except Exception:
-            # If parsing fails, add as-is with default values
+        match = _LEGACY_RE.match(message)
+        if match is None:
+            # Fallback for unparseable messages
             return self.add_message(
                 content=message,
                 buffer_name=buffer_name
             )
         
-        # Fallback for unparseable messages
+        content = match.group(3).strip()
+        level = _LEVEL_MAP.get(match.group(4).strip().lower(), MessageLevel.INFO)
+        
+        # Determine category based on buffer and content
+        buffer_id = _resolve_buffer(buffer_name)
+        if buffer_id is BufferID.SCREENSHOT:
+            category = MessageCategory.SCREENSHOT
+        elif buffer_id is BufferID.DEBUG:
+            category = MessageCategory.DEBUG
+        else:
+            content_lower = content.lower()
+            if "socket" in content_lower:
+                category = MessageCategory.SOCKET
+            elif "ocr" in content_lower:
+                category = MessageCategory.OCR
+            else:
+                category = MessageCategory.SYSTEM
+        
+        # Add the structured message
         return self.add_message(
-            content=message,
+            content=content,
+            level=level,
+            category=category,
             buffer_name=buffer_name
         )
+
+
+# Shared application-wide message manager
+message_manager = MessageManager()
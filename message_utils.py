@@ -1,10 +1,39 @@
 """Utilities for creating and handling standardized Socket.IO messages."""
 
 import enum
+import gzip
+import json
 import time
+import base64
 from typing import Dict, Any, Union, Optional
 from datetime import datetime, timezone
 
+try:
+    # Optional: orjson serializes in C, several times faster than json
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class _OrjsonCodec:
+    """Drop-in for the json module in python-socketio's ``json=`` hook, backed by orjson."""
+
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # Something orjson won't encode; let json decide (and raise) as before
+            return json.dumps(obj, *args, **kwargs)
+
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
+
+# Pass as socketio.Client(json=...) / AsyncServer(json=...)
+socketio_json = _OrjsonCodec if orjson is not None else json
+
 # Define standard message types used across client/server
 class MessageType(enum.Enum):
     """
@@ -98,6 +127,34 @@ def create_ocr_result_message(text: str, source: str = "manual_trigger") -> Dict
         "source": source # Indicate if it was manually triggered or automatic
     }
 
+# OCR text larger than this (in UTF-8 bytes) is sent gzip-compressed internal client -> server
+OCR_TEXT_COMPRESS_THRESHOLD = 4096
+OCR_TEXT_ENCODING_GZIP_B64 = "gzip+b64"
+
+def create_internal_ocr_result_payload(requester_sid: str, text: str) -> Dict[str, Any]:
+    """Creates the OCR_RESULT payload sent from the internal client to the server.
+
+    Large results go as base64-encoded gzip in 'text_gz' with 'enc' set;
+    small ones stay plain in 'text'. Use decode_internal_ocr_text() to read either.
+    """
+    raw = text.encode("utf-8")
+    if len(raw) <= OCR_TEXT_COMPRESS_THRESHOLD:
+        return {"requester_sid": requester_sid, "text": text}
+    return {
+        "requester_sid": requester_sid,
+        "text_gz": base64.b64encode(gzip.compress(raw, compresslevel=6)).decode("ascii"),
+        "enc": OCR_TEXT_ENCODING_GZIP_B64,
+    }
+
+def decode_internal_ocr_text(payload: Dict[str, Any]) -> Optional[str]:
+    """Returns the OCR text from an internal OCR_RESULT payload, or None if missing/corrupt."""
+    if payload.get("enc") != OCR_TEXT_ENCODING_GZIP_B64:
+        return payload.get("text")
+    try:
+        return gzip.decompress(base64.b64decode(payload["text_gz"], validate=True)).decode("utf-8")
+    except (KeyError, TypeError, ValueError, OSError, EOFError):
+        return None
+
 # Kept for server sending welcome message directly to new client
 def create_welcome_message(sid: str) -> Dict[str, Any]:
     """Creates a welcome message."""
@@ -12,12 +12,39 @@ It manages the lifecycle of screenshots, including capture, storage, and cleanup
 - Consider adding support for region-specific screenshot capture
 """
 import os
+import re
+import time
+import queue
+import hashlib
 import logging
-from datetime import datetime, timedelta
+import threading
+from datetime import datetime
 import pytesseract
-from PIL import ImageGrab
+from PIL import Image, ImageGrab
+
+try:
+    # Optional: mss grabs the screen through native APIs and is much faster than ImageGrab
+    import mss
+    mss_available = True
+except ImportError:
+    mss_available = False
+
+try:
+    # Optional: tesserocr calls libtesseract in-process instead of spawning
+    # the tesseract binary (and re-encoding the image) for every OCR call
+    import tesserocr
+    tesserocr_available = True
+except ImportError:
+    tesserocr_available = False
 
 from .path_config import get_screenshots_dir, get_logs_dir
+from .log_utils import attach_queued_file_handler
+
+# Leading/trailing whitespace on each line (newlines themselves are kept)
+_WS_STRIP = re.compile(r'^[^\S\n]+|[^\S\n]+$', re.MULTILINE)
+
+# Frames waiting to be written to disk before new ones are dropped
+SAVE_QUEUE_SIZE = 16
 
 class OCRProcessor:
     """Handles screenshot capture and OCR processing.
@@ -39,67 +66,194 @@ class OCRProcessor:
     def __init__(self):
         self.screenshots_dir = get_screenshots_dir()
         self.logger = self._setup_logging()
+        # Digest and path of the last frame written to disk, used to skip
+        # saving identical frames while the screen is idle
+        self._last_frame_hash = None
+        self._last_frame_path = None
+        # (digest, path, image) of the last captured frame, kept decoded so
+        # in-process OCR can skip the PNG round trip; assigned as one tuple so
+        # readers on other threads never see a mismatched digest and image.
+        # The disk copy is written by a background thread
+        self._last_capture = None
+        # (digest, text) of the last frame OCRed, to skip Tesseract on a static
+        # screen; one tuple for the same reason as _last_capture, since OCR
+        # runs from both the UI and socket requests
+        self._prev_ocr = None
+        # PNG encoding happens on a single writer thread fed by this queue,
+        # so capture never waits on disk; paths queued or being written are
+        # tracked so they count as existing
+        self._save_q = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+        self._pending_saves = set()
+        threading.Thread(target=self._save_worker, name="screenshot-writer", daemon=True).start()
+        # Newest screenshot written by this processor; spares get_latest_screenshot a directory scan
+        self._latest_path = None
+        # mss handle, created lazily on the capturing thread and reused across frames
+        self._sct = None
+        self._use_mss = mss_available
+        # tesserocr API handle, created on first OCR and reused; it is not
+        # thread-safe, so calls are serialized
+        self._tess = None
+        self._tess_lock = threading.Lock()
+        self._use_tesserocr = tesserocr_available
     
     def _setup_logging(self):
-        """Configure OCR processor logging."""
+        """Configure OCR processor logging (file writes happen on a listener thread)."""
         log_file = os.path.join(get_logs_dir(), "ocr_processor.log")
         
         logger = logging.getLogger('Threethreeter-OCR')
         logger.setLevel(logging.INFO)
         
         if not logger.handlers:
-            handler = logging.FileHandler(log_file)
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
+            attach_queued_file_handler(logger, log_file)
         
         return logger
 
+    def _grab_screen(self):
+        """Grab the primary display as an RGB image, using mss when available."""
+        if self._use_mss:
+            try:
+                if self._sct is None:
+                    self._sct = mss.mss()
+                # monitors[1] is the primary display, matching ImageGrab.grab()
+                raw = self._sct.grab(self._sct.monitors[1])
+                return Image.frombytes("RGB", raw.size, raw.bgra, "raw", "BGRX")
+            except Exception as e:
+                self.logger.warning(f"mss capture failed ({e}), falling back to ImageGrab")
+                self._use_mss = False
+                self._sct = None
+        return ImageGrab.grab()
+
     def capture_screenshot(self):
-        """Capture a screenshot and save it."""
+        """Capture a screenshot and save it.
+
+        Returns the saved path, or None if the capture failed or the screen
+        is unchanged since the last saved frame.
+        """
         try:
+            # Capture the screenshot
+            screenshot = self._grab_screen()
+
+            # Skip the encode entirely when the frame is pixel-identical to the last one
+            frame_hash = hashlib.blake2b(screenshot.tobytes(), digest_size=16).digest()
+            last_path = self._last_frame_path
+            saving = last_path in self._pending_saves
+            if frame_hash == self._last_frame_hash and last_path and (saving or os.path.exists(last_path)):
+                if not saving:
+                    # Refresh its mtime so cleanup keeps the latest frame around
+                    os.utime(last_path)
+                self.logger.debug("Screen unchanged, skipped saving screenshot")
+                return None
+
             timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
             filename = f"screenshot_{timestamp}.png"
             filepath = os.path.join(self.screenshots_dir, filename)
-            
-            # Capture the screenshot
-            screenshot = ImageGrab.grab()
-            screenshot.save(filepath)
-            
-            self.logger.debug(f"Screenshot saved: {filename}")
+
+            # In-process OCR uses the frame from memory even if its write is dropped
+            self._last_capture = (frame_hash, filepath, screenshot)
+            self._pending_saves.add(filepath)
+            try:
+                self._save_q.put_nowait((screenshot, filepath))
+            except queue.Full:
+                # Back-pressure: the disk can't keep up, skip writing this frame
+                self._pending_saves.discard(filepath)
+                self.logger.warning(f"Screenshot write queue full, dropped {filename}")
+                return None
+
+            self._last_frame_hash = frame_hash
+            self._last_frame_path = filepath
+            self._latest_path = filepath
             return filepath
         except Exception as e:
             self.logger.error(f"Screenshot capture failed: {e}")
             return None
 
+    def _save_worker(self):
+        """Write queued frames to disk in order; runs on the writer thread."""
+        while True:
+            screenshot, filepath = self._save_q.get()
+            try:
+                self._save_screenshot(screenshot, filepath)
+            finally:
+                self._pending_saves.discard(filepath)
+                self._save_q.task_done()
+
+    def _save_screenshot(self, screenshot, filepath):
+        """Write a frame to disk atomically."""
+        # Written under a name the screenshot filters ignore, then renamed, so
+        # other processes never read a half-written PNG
+        tmp_path = filepath + ".tmp"
+        try:
+            # Fastest zlib level: the file is read back by Tesseract within
+            # seconds and deleted shortly after, so size barely matters but
+            # encode time is paid on every capture.
+            screenshot.save(tmp_path, format="PNG", compress_level=1)
+            os.replace(tmp_path, filepath)
+            self.logger.debug(f"Screenshot saved: {os.path.basename(filepath)}")
+        except Exception as e:
+            self.logger.error(f"Screenshot save failed: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
     def get_latest_screenshot(self):
         """Get the path of the most recent screenshot."""
+        latest = self._latest_path
+        if latest is not None:
+            if latest in self._pending_saves or os.path.exists(latest):
+                return latest
+            self._latest_path = None
         try:
-            files = [f for f in os.listdir(self.screenshots_dir) 
-                    if f.startswith("screenshot_") and f.endswith(".png")]
-            if not files:
+            # Cold start (or a processor that doesn't capture): names embed the
+            # capture time, so the largest name is the newest; no stat needed
+            with os.scandir(self.screenshots_dir) as entries:
+                newest = max(
+                    (e.name for e in entries
+                     if e.name.startswith("screenshot_") and e.name.endswith(".png")),
+                    default=None
+                )
+            if newest is None:
                 return None
-                
-            files.sort(reverse=True)
-            return os.path.join(self.screenshots_dir, files[0])
+            return os.path.join(self.screenshots_dir, newest)
         except Exception as e:
             self.logger.error(f"Error getting latest screenshot: {e}")
             return None
 
-    def process_image(self, filepath):
-        """Process a screenshot with OCR."""
+    def _image_to_string(self, image):
+        """Run OCR on a PIL image, using tesserocr when available."""
+        if self._use_tesserocr:
+            try:
+                with self._tess_lock:
+                    if self._tess is None:
+                        self._tess = tesserocr.PyTessBaseAPI()
+                    self._tess.SetImage(image)
+                    return self._tess.GetUTF8Text()
+            except Exception as e:
+                self.logger.warning(f"tesserocr failed ({e}), falling back to pytesseract")
+                self._use_tesserocr = False
+                self._tess = None
+        return pytesseract.image_to_string(image)
+
+    def process_image(self, image):
+        """Process a screenshot with OCR; accepts a file path or a PIL image."""
         try:
+            # 8-bit grayscale is a third of the RGB bytes pytesseract re-encodes
+            # and pipes to tesseract, which would convert it itself anyway
+            if isinstance(image, (str, os.PathLike)):
+                with Image.open(image) as img:
+                    gray = img.convert("L")
+            else:
+                gray = image.convert("L")
+
             # Extract text using Tesseract
-            text = pytesseract.image_to_string(filepath)
+            text = self._image_to_string(gray)
             
             if not text.strip():
                 self.logger.warning("No text found in screenshot")
                 return None
             
-            # Trim excessive whitespace while preserving newlines
-            text = '\n'.join(line.strip() for line in text.splitlines())
+            # Trim excessive whitespace while preserving newlines, in one regex pass
+            text = _WS_STRIP.sub('', text)
             
             return text
             
@@ -111,19 +265,18 @@ class OCRProcessor:
         """Delete screenshots older than max_age seconds. Returns number of files deleted."""
         try:
             deleted_count = 0
-            cutoff = datetime.now() - timedelta(seconds=max_age)
+            # Plain epoch floats: st_mtime is already one, no datetime objects per file
+            cutoff = time.time() - max_age
             
-            for filename in os.listdir(self.screenshots_dir):
-                if not filename.startswith("screenshot_"):
-                    continue
+            with os.scandir(self.screenshots_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("screenshot_"):
+                        continue
                     
-                filepath = os.path.join(self.screenshots_dir, filename)
-                modified_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                
-                if modified_time < cutoff:
-                    os.remove(filepath)
-                    deleted_count += 1
-                    self.logger.debug(f"Deleted old screenshot: {filename}")
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff:
+                        os.remove(entry.path)
+                        deleted_count += 1
+                        self.logger.debug(f"Deleted old screenshot: {entry.name}")
             
             return deleted_count
             
@@ -133,12 +286,23 @@ class OCRProcessor:
 
     def process_latest_screenshot(self):
         """Process the most recent screenshot and return results."""
-        latest = self.get_latest_screenshot()
-        if not latest:
-            self.logger.error("No screenshots available")
-            return None
-            
-        text = self.process_image(latest)
+        last_capture = self._last_capture
+        if last_capture is not None:
+            # Captured by this processor: OCR the frame still in memory
+            frame_hash, latest, image = last_capture
+            prev_ocr = self._prev_ocr
+            if prev_ocr is not None and prev_ocr[0] == frame_hash:
+                self.logger.debug("Screen unchanged since last OCR, reusing text")
+                return prev_ocr[1]
+            text = self.process_image(image)
+            if text:  # Failures are not cached so they can be retried
+                self._prev_ocr = (frame_hash, text)
+        else:
+            latest = self.get_latest_screenshot()
+            if not latest:
+                self.logger.error("No screenshots available")
+                return None
+            text = self.process_image(latest)
         if not text:
             return None
             
@@ -1,12 +1,18 @@
 """Process management module for Threethreeter application."""
 import os
+import re
 import sys
 import time
+import queue
+import select
+import socket
 import logging
+import selectors
 import subprocess
 import threading
 import traceback
 from collections import deque
+from dataclasses import dataclass, field
 from typing import Dict, Optional, List, Union, IO, Tuple, Any
 from datetime import datetime
 import socketio
@@ -14,14 +20,14 @@ import socketio
 from pathlib import Path
 
 # Add MessageType import
-from .message_utils import MessageType
+from .message_utils import MessageType, socketio_json
 
 try:
     from .path_config import get_logs_dir, get_screenshots_dir, get_temp_dir, get_project_root
     from .server_config import get_server_config, DEFAULT_CONFIG as SERVER_DEFAULT_CONFIG
     from .config_loader import config as config_manager
     from .screenshot_manager import ScreenshotManager
-    from .message_system import MessageManager, MessageLevel, MessageCategory
+    from .message_system import message_manager, MessageLevel, MessageCategory
 except ImportError as e:
     print(f"Error importing required modules in process_manager.py: {e}", file=sys.stderr)
     traceback.print_exc(file=sys.stderr)
@@ -32,6 +38,55 @@ import glob
 # Path to server.py directly within the Threethreeter directory (our new root)
 SOCKETIO_SERVER_SCRIPT = os.path.join(get_project_root(), "server.py")
 STARTUP_TIMEOUT = 10  # seconds to wait for server startup message
+PIPE_READ_SIZE = 65536  # bytes per os.read of the server's stdout/stderr
+
+def _preview(text: str, limit: int = 50) -> str:
+    """First `limit` characters of text, with '...' if it was cut."""
+    return text[:limit] + ("..." if len(text) > limit else "")
+
+
+# Lookups for _add_to_buffer, built once instead of per message
+_LEVELS = {level.name.lower(): level for level in MessageLevel}
+_BUFFER_CATEGORIES = {
+    "screenshot": MessageCategory.SCREENSHOT,
+    "debug": MessageCategory.SOCKET,
+}
+
+# Constant parts of outbound payloads
+_SENDER = 'localBackend'
+_OCR_RESULT_EVENT = MessageType.OCR_RESULT.value
+
+# (debug, status) buffer lines for a send dropped while disconnected, built
+# once; this path repeats for every send while the server is down
+_NOT_CONNECTED_LINES = {
+    what: (f"INTERNAL_CLIENT_WARN: Cannot send {what} - not connected.",
+           f"WARNING: Cannot send {what} - Socket.IO not connected.")
+    for what in ("message", "OCR")
+}
+
+# Classifies a raw line of server output in one pass; m.lastgroup names the
+# leftmost alternative that matched. Drops only engineio's heartbeat packet
+# lines and its DEBUG records; levels come from the server's log-level field
+# ('%(asctime)s - %(name)s - %(levelname)s - ...'), not from words in the message
+_LINE_RE = re.compile(
+    rb'(?P<drop>\bpacket (?:PING|PONG) data\b| - engineio[\w.]* - DEBUG - )'
+    rb'| - (?:(?P<error>ERROR|CRITICAL)|(?P<warn>WARNING)) - '
+    rb'|(?i:(?P<conn>client connected)|(?P<disc>client disconnected))'
+)
+# Bare heartbeat lines, rejected with a prefix compare before the regex runs
+_NOISE_PREFIXES = (b'ping', b'pong', b'PING', b'PONG', b'Ping', b'Pong')
+# Buffer level per matched group; unmatched lines keep their stream's default
+_LINE_LEVELS = {"error": "error", "warn": "warning", "conn": "info", "disc": "info"}
+
+@dataclass(slots=True)
+class _ServiceState:
+    """Bookkeeping for one managed subprocess, kept together."""
+    process: Optional[subprocess.Popen] = None
+    # Linux pidfd for the process; readable once it exits
+    pidfd: Optional[int] = None
+    monitor_thread: Optional[threading.Thread] = None
+    stop_event: threading.Event = field(default_factory=threading.Event)
+
 
 class ProcessManager:
     """Manages the lifecycle of core Threethreeter processes."""
@@ -39,16 +94,32 @@ class ProcessManager:
     def __init__(self):
         self.logger = logging.getLogger('Threethreeter-ProcessManager')
         self.config = get_server_config()
-        self.message_manager = MessageManager()  # Initialize MessageManager first
-
-        self.socketio_process: Optional[subprocess.Popen] = None
-        self.socketio_monitor_thread: Optional[threading.Thread] = None
-        self.socketio_stop_event = threading.Event()
+        # Server address and room, read once; the config is loaded at startup
+        server_cfg = self.config.get('server', {})
+        self._host = server_cfg.get('host', '0.0.0.0')
+        self._port = int(server_cfg.get('port', 5348))
+        self._room = server_cfg.get('room', 'Threethreeter_room')
+        # Where local clients connect: the wildcard bind address isn't connectable
+        self._connect_host = '127.0.0.1' if self._host == '0.0.0.0' else self._host
+        self._server_url = f"http://{self._connect_host}:{self._port}"
+        self.message_manager = message_manager  # Shared MessageManager, set up first
+
+        self._socketio = _ServiceState()
+        # Capture the server's stdout/stderr into the debug buffer; when off
+        # it is discarded and only the process exit is watched
+        self.monitor_output = bool(config_manager.get('server', 'monitor_output', default=True))
 
         # Internal Socket.IO client for ProcessManager communication
         self.internal_sio_client: Optional[socketio.Client] = None
         self.internal_sio_connect_thread: Optional[threading.Thread] = None
-        self.internal_sio_connected = threading.Event()  # Event to signal connection status
+        # Set/cleared by the client's connect/disconnect handlers; senders
+        # check this instead of asking the socketio client each time
+        self.internal_sio_connected = threading.Event()
+        self.internal_sio_registered = threading.Event()  # Set when the server acks our registration
+        # Outbound (event, payload) pairs; a single writer thread emits them so
+        # callers never block on the websocket
+        self._tx_queue = queue.SimpleQueue()
+        threading.Thread(target=self._tx_worker, name="sio-writer", daemon=True).start()
 
         # Screenshot Manager - Pass the initialized message_manager
         self.screenshot_manager = ScreenshotManager(self.message_manager)
@@ -59,21 +130,18 @@ class ProcessManager:
 
     def _add_to_buffer(self, buffer_name: str, content: str, level: str = "info"):
         """Helper to add messages to the MessageManager."""
-        msg_level = getattr(MessageLevel, level.upper(), MessageLevel.INFO)
-        category = MessageCategory.SYSTEM  # Default category
-        if buffer_name == "screenshot":
-            category = MessageCategory.SCREENSHOT
-        elif buffer_name == "debug":
-            category = MessageCategory.SOCKET  # FIX: Changed SOCKETIO to SOCKET
-
         self.message_manager.add_message(
             content=content,
-            level=msg_level,
-            category=category,
+            level=_LEVELS.get(level, MessageLevel.INFO),
+            category=_BUFFER_CATEGORIES.get(buffer_name, MessageCategory.SYSTEM),
             source="process_manager",
             buffer_name=buffer_name
         )
 
+    def add_change_listener(self, callback) -> None:
+        """Register a no-argument callback fired whenever new output is buffered (used by the UI to redraw)."""
+        self.message_manager.add_listener(callback)
+
     def get_output(self, buffer_name: str) -> List[str]:
         """Get formatted output from a specific buffer."""
         # FIX: Changed get_formatted_buffer to get_formatted_messages
@@ -84,10 +152,10 @@ class ProcessManager:
         """Get the current status of managed processes."""
         try:
             socketio_status = "Stopped"
-            if self.socketio_process and self.socketio_process.poll() is None:
+            if self._is_server_running():
                 socketio_status = "Running"
-            elif self.socketio_process:
-                socketio_status = f"Stopped (Code: {self.socketio_process.poll()})"
+            elif self._socketio.process:
+                socketio_status = f"Stopped (Code: {self._socketio.process.poll()})"
 
             screenshot_status = "Stopped"
             if self.screenshot_thread and self.screenshot_thread.is_alive():
@@ -103,6 +171,7 @@ class ProcessManager:
                 "socketio_server": socketio_status,
                 "screenshot_capture": screenshot_status,
                 "internal_sio_connected": self.internal_sio_connected.is_set(),
+                "internal_sio_registered": self.internal_sio_registered.is_set(),
                 "config": self.config  # Include current config for status view
             }
             # Add logging before returning
@@ -122,7 +191,7 @@ class ProcessManager:
 
     def start_socketio_server(self):
         """Start the Socket.IO server process."""
-        if self.socketio_process and self.socketio_process.poll() is None:
+        if self._is_server_running():
             self.logger.warning("Socket.IO server already running.")
             self._add_to_buffer("status", "Socket.IO server already running.", "warning")
             return
@@ -134,10 +203,8 @@ class ProcessManager:
             self._add_to_buffer("status", f"ERROR: Server script not found at {server_script}", "error")
             return
 
-        # Get config values safely
-        server_cfg = self.config.get('server', {})
-        host = server_cfg.get('host', '0.0.0.0')
-        port = server_cfg.get('port', 5348)
+        host = self._host
+        port = self._port
 
         # Prepare environment - Remove explicit PYTHONPATH setting
         env = os.environ.copy()
@@ -153,129 +220,253 @@ class ProcessManager:
         self.logger.info(f"Starting Socket.IO server: {' '.join(command)}")
         self._add_to_buffer("status", f"Starting Socket.IO server on {host}:{port}...", "info")
 
+        # Unmonitored output goes straight to /dev/null: nothing is copied,
+        # filtered or buffered for a view that will never show it
+        output = subprocess.PIPE if self.monitor_output else subprocess.DEVNULL
+
         try:
-            self.socketio_process = subprocess.Popen(
+            self._socketio.process = subprocess.Popen(
                 command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,  # Line buffered
-                env=env
+                stdout=output,
+                stderr=output,
+                bufsize=0,  # Raw pipes; the monitor reads and splits lines itself
+                env=env,
+                # Fds Python opens are non-inheritable already (PEP 446), and
+                # leaving close_fds off lets subprocess spawn via posix_spawn
+                # rather than fork, so the parent's memory isn't duplicated
+                close_fds=False
             )
 
-            self.socketio_stop_event.clear()
-            self.socketio_monitor_thread = threading.Thread(
+            self._close_pidfd()  # Left over from a server that exited on its own
+            self._socketio.pidfd = self._open_pidfd(self._socketio.process)
+
+            self._socketio.stop_event.clear()
+            self._socketio.monitor_thread = threading.Thread(
                 target=self._monitor_socketio_process,
                 daemon=True
             )
-            self.socketio_monitor_thread.start()
-            self.logger.info(f"Socket.IO server process started (PID: {self.socketio_process.pid}). Monitor thread active.")
-            self._add_to_buffer("status", f"Socket.IO server process started (PID: {self.socketio_process.pid}).", "info")
+            self._socketio.monitor_thread.start()
+            self.logger.info(f"Socket.IO server process started (PID: {self._socketio.process.pid}). Monitor thread active.")
+            self._add_to_buffer("status", f"Socket.IO server process started (PID: {self._socketio.process.pid}).", "info")
 
         except Exception as e:
             self.logger.error(f"Failed to start Socket.IO server: {e}", exc_info=True)
             self._add_to_buffer("status", f"ERROR: Failed to start Socket.IO server: {e}", "error")
-            self.socketio_process = None
+            self._socketio.process = None
+
+    @staticmethod
+    def _open_pidfd(process: subprocess.Popen) -> Optional[int]:
+        """Open a pidfd for process where supported (Linux 5.3+), else None."""
+        if not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            return os.pidfd_open(process.pid)
+        except OSError:
+            return None
+
+    def _close_pidfd(self):
+        """Close the server's pidfd, if one is open."""
+        pidfd, self._socketio.pidfd = self._socketio.pidfd, None
+        if pidfd is not None:
+            try:
+                os.close(pidfd)
+            except OSError:
+                pass
+
+    def _is_server_running(self) -> bool:
+        """Whether the Socket.IO server process is alive, without a waitpid when a pidfd is available."""
+        state = self._socketio
+        process = state.process
+        if process is None or process.returncode is not None:
+            return False
+        pidfd = state.pidfd
+        if pidfd is None:
+            return process.poll() is None
+        try:
+            ready, _, _ = select.select([pidfd], [], [], 0)
+        except (OSError, ValueError):
+            return process.poll() is None
+        if ready:
+            process.poll()  # Exited: reap it so returncode is set
+            return False
+        return True
+
+    @staticmethod
+    def _wait_for_exit(process: subprocess.Popen, pidfd: Optional[int], timeout: float) -> Optional[int]:
+        """Wait up to timeout seconds for process to exit. Returns its exit code, or None if still running.
+
+        With a pidfd this is one blocking select() instead of Popen.wait's sleep/poll loop.
+        """
+        if process.returncode is not None:
+            return process.returncode
+        if pidfd is not None:
+            try:
+                ready, _, _ = select.select([pidfd], [], [], timeout)
+            except (OSError, ValueError):
+                pass  # pidfd closed under us; fall back to Popen.wait
+            else:
+                return process.wait() if ready else None
+        try:
+            return process.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return None
+
+    def _wait_for_port(self, host: str, port: int, timeout: float = 5.0) -> bool:
+        """Wait until host:port accepts TCP connections. Returns False on timeout or server exit."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                # Bounded per attempt so an unreachable or filtered host can't
+                # block past the deadline; resolves names and IPv6 too
+                socket.create_connection((host, int(port)), timeout=min(0.1, max(remaining, 0.001))).close()
+                return True
+            except OSError:
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            if self._socketio.process and not self._is_server_running():
+                return False  # Server died; no point waiting out the timeout
+            time.sleep(0.01)
 
     def _monitor_socketio_process(self):
         """Monitor the stdout/stderr of the Socket.IO server process."""
-        if not self.socketio_process or not self.socketio_process.stdout or not self.socketio_process.stderr:
-            self.logger.error("Socket.IO process or pipes not available for monitoring.")
+        state = self._socketio
+        process = state.process
+        if not process:
+            self.logger.error("Socket.IO process not available for monitoring.")
             return
 
-        self.logger.info("Socket.IO monitor thread started (Using simplified read loop for debug).")
+        self.logger.info("Socket.IO monitor thread started.")
+
+        # One selector over both pipes replaces a blocking readline thread per
+        # stream; reads are non-blocking and partial lines are kept per fd
+        sel = selectors.DefaultSelector()
+        pending = {}
+        for stream, name in ((process.stdout, "STDOUT"), (process.stderr, "STDERR")):
+            if stream is None:
+                continue  # Output discarded (monitor_output off)
+            fd = stream.fileno()
+            os.set_blocking(fd, False)
+            sel.register(fd, selectors.EVENT_READ, data=name)
+            pending[fd] = bytearray()
+        # The pidfd turns readable when the server exits, so the exit is seen
+        # in the same select() as the output rather than by polling waitpid
+        pidfd = state.pidfd
+        if pidfd is not None:
+            sel.register(pidfd, selectors.EVENT_READ, data="EXIT")
 
-        # --- Simplified STDOUT Reading Loop (for debugging) ---
-        def read_stdout():
-            if not self.socketio_process or not self.socketio_process.stdout:
-                return
-            try:
-                for line in iter(self.socketio_process.stdout.readline, ''): # Blocking read line by line
-                    line = line.strip()
-                    if line:
-                        self.logger.info(f"MONITOR_SIMPLE_READ [STDOUT]: {line}") # Use INFO for visibility
-                        self._add_to_buffer("debug", f"SERVER_STDOUT: {line}", "info")
-                    if self.socketio_stop_event.is_set():
-                        break
-            except Exception as e:
-                 self.logger.error(f"Error in simplified stdout read loop: {e}", exc_info=True)
-            finally:
-                 self.logger.info("Simplified stdout read loop finished.")
-
-        stdout_thread = threading.Thread(target=read_stdout, daemon=True)
-        stdout_thread.start()
-        # --- End Simplified STDOUT Reading Loop ---
-
-        # --- Keep monitoring STDERR (using select or simplified) ---
-        # For now, let's keep stderr monitoring simple too
-        def read_stderr():
-            if not self.socketio_process or not self.socketio_process.stderr:
-                return
-            try:
-                for line in iter(self.socketio_process.stderr.readline, ''): # Blocking read line by line
-                    line = line.strip()
-                    if line:
-                        self.logger.error(f"MONITOR_SIMPLE_READ [STDERR]: {line}") # Use ERROR for visibility
-                        self._add_to_buffer("debug", f"SERVER_STDERR: {line}", "error")
-                    if self.socketio_stop_event.is_set():
+        try:
+            if not sel.get_map():
+                # Nothing to select on (no pipes, no pidfd): just wait for exit
+                while not state.stop_event.is_set():
+                    try:
+                        process.wait(timeout=0.5)
                         break
-            except Exception as e:
-                 self.logger.error(f"Error in simplified stderr read loop: {e}", exc_info=True)
-            finally:
-                 self.logger.info("Simplified stderr read loop finished.")
-
-        stderr_thread = threading.Thread(target=read_stderr, daemon=True)
-        stderr_thread.start()
-        # --- End Simplified STDERR Reading Loop ---
-
-        # Keep the main monitor thread alive to check for process termination and wait for stop event
-        while not self.socketio_stop_event.is_set():
-            if self.socketio_process and self.socketio_process.poll() is not None:
-                self.logger.warning(f"Socket.IO server process terminated unexpectedly with code {self.socketio_process.poll()}.")
-                self._add_to_buffer("status", f"WARNING: Socket.IO server stopped unexpectedly (Code: {self.socketio_process.poll()}).", "warning")
-                self._add_to_buffer("debug", f"SERVER_EXIT: Process terminated with code {self.socketio_process.poll()}", "warning")
-                if self.internal_sio_connected.is_set():
-                    self.logger.info("Marking internal client as disconnected due to server process termination.")
-                    self.internal_sio_connected.clear()
-                break
-            time.sleep(0.5) # Main loop sleep
-
-        # Wait for reader threads to finish (they should exit when stop_event is set or process ends)
-        self.logger.info("Waiting for stdout/stderr reader threads to join...")
-        stdout_thread.join(timeout=1.0)
-        stderr_thread.join(timeout=1.0)
-        self.logger.info("Reader threads joined (or timed out).")
-
-        exit_code = self.socketio_process.poll()
+                    except subprocess.TimeoutExpired:
+                        pass
+            while sel.get_map() and not state.stop_event.is_set():
+                for key, _ in sel.select(timeout=0.5):
+                    fd = key.fd
+                    if key.data == "EXIT":
+                        sel.unregister(fd)
+                        process.wait()  # Already exited; just reaps it
+                        continue
+                    buf = pending[fd]
+                    # Drain everything the pipe holds before selecting again
+                    # (as an edge-triggered loop would): one wakeup per burst
+                    eof = False
+                    while True:
+                        try:
+                            chunk = os.read(fd, PIPE_READ_SIZE)
+                        except BlockingIOError:
+                            break
+                        if not chunk:
+                            eof = True
+                            break
+                        buf += chunk
+                        if len(chunk) < PIPE_READ_SIZE:
+                            break  # Short read: nothing more buffered right now
+                    # Hand out complete lines in place, then drop them with one
+                    # delete; only the unterminated tail stays buffered
+                    start = 0
+                    nl = buf.find(b"\n")
+                    while nl >= 0:
+                        self._process_server_line(key.data, buf[start:nl])
+                        start = nl + 1
+                        nl = buf.find(b"\n", start)
+                    del buf[:start]
+                    if eof:
+                        # Flush any unterminated tail and stop watching the pipe
+                        sel.unregister(fd)
+                        self._process_server_line(key.data, buf)
+        except Exception as e:
+            self.logger.error(f"Error in Socket.IO output monitor: {e}", exc_info=True)
+        finally:
+            sel.close()
+            self.logger.info("Socket.IO output monitor finished.")
+
+        # The process is only asked about once, after the reads end (EOF or stop)
+        stopping = state.stop_event.is_set()
+        exit_code = process.returncode
+        if exit_code is None:
+            exit_code = self._wait_for_exit(process, state.pidfd, 0 if stopping else 1.0)
+
         if exit_code is not None:
+            if not stopping:
+                # Pipes closed on their own: the server went away
+                self.logger.warning(f"Socket.IO server process terminated unexpectedly with code {exit_code}.")
+                self._add_to_buffer("status", f"WARNING: Socket.IO server stopped unexpectedly (Code: {exit_code}).", "warning")
+                self._add_to_buffer("debug", f"SERVER_EXIT: Process terminated with code {exit_code}", "warning")
             self.logger.info(f"Socket.IO process final exit code: {exit_code}")
             self._add_to_buffer("debug", f"SERVER_FINAL_EXIT: Code {exit_code}", "warning" if exit_code != 0 else "info")
             if self.internal_sio_connected.is_set():
                 self.logger.info("Marking internal client disconnected as server process exited.")
                 self.internal_sio_connected.clear()
+            self.internal_sio_registered.clear()
+
+    def _process_server_line(self, stream: str, raw: Union[bytes, bytearray]):
+        """Route one line of server output to the log and the debug buffer."""
+        if raw.startswith(_NOISE_PREFIXES):
+            return
+        m = _LINE_RE.search(raw)
+        kind = m.lastgroup if m else None
+        if kind == "drop":
+            return  # Heartbeat / engineio debug noise
+        line = raw.decode("utf-8", errors="replace").strip()
+        if not line:
+            return
+        if stream == "STDERR":
+            level = _LINE_LEVELS.get(kind, "error")
+            self.logger.log(getattr(logging, level.upper()), f"MONITOR_READ [STDERR]: {line}")
+            self._add_to_buffer("debug", f"SERVER_STDERR: {line}", level)
+        else:
+            level = _LINE_LEVELS.get(kind, "info")
+            self.logger.info(f"MONITOR_READ [STDOUT]: {line}")
+            self._add_to_buffer("debug", f"SERVER_STDOUT: {line}", level)
 
     def stop_socketio_server(self):
         """Stop the Socket.IO server process."""
+        state = self._socketio
         self.logger.info("Stopping Socket.IO server...")
         self._add_to_buffer("status", "Stopping Socket.IO server...", "info")
 
         # Disconnect internal client first
         self._disconnect_internal_client()
 
-        if self.socketio_monitor_thread:
-            self.socketio_stop_event.set()  # Signal monitor thread to stop
+        if state.monitor_thread:
+            state.stop_event.set()  # Signal monitor thread to stop
 
-        if self.socketio_process and self.socketio_process.poll() is None:
+        if self._is_server_running():
             try:
-                self.socketio_process.terminate()  # Send SIGTERM
-                try:
-                    self.socketio_process.wait(timeout=5)  # Wait up to 5 seconds
+                state.process.terminate()  # Send SIGTERM
+                if self._wait_for_exit(state.process, state.pidfd, 5) is not None:  # Wait up to 5 seconds
                     self.logger.info("Socket.IO server process terminated gracefully.")
                     self._add_to_buffer("status", "Socket.IO server stopped.", "info")
-                except subprocess.TimeoutExpired:
+                else:
                     self.logger.warning("Socket.IO server did not terminate gracefully, sending SIGKILL.")
-                    self.socketio_process.kill()  # Force kill
-                    self.socketio_process.wait()  # Wait for kill
+                    state.process.kill()  # Force kill
+                    state.process.wait()  # Wait for kill
                     self.logger.info("Socket.IO server process killed.")
                     self._add_to_buffer("status", "Socket.IO server force-stopped.", "warning")
             except Exception as e:
@@ -286,16 +477,17 @@ class ProcessManager:
             self._add_to_buffer("status", "Socket.IO server already stopped.", "info")
 
         # Wait for monitor thread to finish
-        if self.socketio_monitor_thread and self.socketio_monitor_thread.is_alive():
+        if state.monitor_thread and state.monitor_thread.is_alive():
             self.logger.debug("Waiting for Socket.IO monitor thread to join...")
-            self.socketio_monitor_thread.join(timeout=2)
-            if self.socketio_monitor_thread.is_alive():
+            state.monitor_thread.join(timeout=2)
+            if state.monitor_thread.is_alive():
                 self.logger.warning("Socket.IO monitor thread did not join cleanly.")
             else:
                 self.logger.debug("Socket.IO monitor thread joined.")
 
-        self.socketio_process = None
-        self.socketio_monitor_thread = None
+        self._close_pidfd()
+        state.process = None
+        state.monitor_thread = None
         self.logger.info("Socket.IO server stop sequence complete.")
 
     # --- Internal Socket.IO Client Methods ---
@@ -309,18 +501,20 @@ class ProcessManager:
         self.logger.info("Setting up internal Socket.IO client...")
         # Disable verbose library logging for the internal client
         # ProcessManager logs essential events to the debug buffer anyway.
-        self.internal_sio_client = socketio.Client(logger=False, engineio_logger=False)
+        self.internal_sio_client = socketio.Client(logger=False, engineio_logger=False, json=socketio_json)
 
         @self.internal_sio_client.event
         def connect():
             self.logger.info("***** INTERNAL CLIENT CONNECTED *****")
             self.internal_sio_connected.set()
+            self.internal_sio_registered.clear()
             self._add_to_buffer("debug", "INTERNAL_CLIENT: Connected successfully", "info")
             try:
-                room = self.config.get('server', {}).get('room', 'Threethreeter_room')
+                room = self._room
                 self.logger.info(f"Internal client joining room: {room}")
-                # Emit register_internal_client instead of just join_room
-                self.internal_sio_client.emit('register_internal_client', {})
+                # Emit register_internal_client instead of just join_room; the
+                # server's ack sets internal_sio_registered
+                self.internal_sio_client.emit('register_internal_client', {}, callback=self._on_registered)
                 self.logger.info("Internal client registration emitted.")
                 # Server side handles joining the room upon registration
                 self._add_to_buffer("debug", f"INTERNAL_CLIENT: Registration sent (joins room '{room}' on server)", "info")
@@ -339,6 +533,7 @@ class ProcessManager:
             was_connected = self.internal_sio_connected.is_set()
             self.logger.warning(f"***** INTERNAL CLIENT DISCONNECTED ***** (Was previously connected: {was_connected})")
             self.internal_sio_connected.clear()
+            self.internal_sio_registered.clear()
             if was_connected:
                 self._add_to_buffer("debug", "INTERNAL_CLIENT: Disconnected (previously connected)", "warning")
             else:
@@ -351,8 +546,8 @@ class ProcessManager:
             # but we keep the check just in case.
             if event not in ['ping', 'pong']:
                 # Log non-ping/pong events received by the internal client to the debug buffer
-                self.logger.debug(f"Internal client received event '{event}': {data}")
-                self._add_to_buffer("debug", f"INTERNAL_CLIENT_RECV: Event='{event}', Data='{str(data)[:100]}...'", "info")
+                self.logger.debug("Internal client received event '%s': %s", event, data)
+                self._add_to_buffer("debug", f"INTERNAL_CLIENT_RECV: Event='{event}', Data='{_preview(str(data), 100)}'", "info")
 
         # Add handler for PERFORM_OCR_REQUEST from the server
         @self.internal_sio_client.on(MessageType.PERFORM_OCR_REQUEST.value)
@@ -377,13 +572,9 @@ class ProcessManager:
             return
 
         try:
-            # Add a small delay before attempting connection
-            time.sleep(0.75)  # Increased delay slightly
-            server_cfg = get_server_config().get('server', {})
-            host = server_cfg.get('host', '0.0.0.0')
-            connect_host = '127.0.0.1' if host == '0.0.0.0' else host
-            port = server_cfg.get('port', 5348)
-            server_url = f"http://{connect_host}:{port}"
+            # Returns as soon as the server is listening (immediately if it already is)
+            self._wait_for_port(self._connect_host, self._port)
+            server_url = self._server_url
             self.logger.info(f"Internal client attempting connection to {server_url}...")
             self._add_to_buffer("debug", f"INTERNAL_CLIENT: Connecting to {server_url}...", "info")
 
@@ -404,13 +595,55 @@ class ProcessManager:
             self.internal_sio_connected.clear()
             self._add_to_buffer("debug", f"INTERNAL_CLIENT_ERROR: Unexpected error during connect(): {e}", "error")
         finally:
-            # Check status after attempting connection
-            # Note: client might disconnect *after* this thread finishes but before status is checked elsewhere
-            if self.internal_sio_client and self.internal_sio_client.connected:
-                self.logger.info("Internal client connection thread finished - Client IS connected at thread exit.")
+            # Wait for the registration ack instead of sampling the socket state
+            if self.internal_sio_connected.is_set() and self.internal_sio_registered.wait(timeout=2.0):
+                self.logger.info("Internal client connection thread finished - Client IS connected and registered.")
+            elif self.internal_sio_client and self.internal_sio_client.connected:
+                self.logger.warning("Internal client connection thread finished - Client connected but registration not acknowledged.")
             else:
                 self.logger.warning("Internal client connection thread finished - Client IS NOT connected at thread exit.")
 
+    def _on_registered(self, *args):
+        """Ack callback for register_internal_client."""
+        self.internal_sio_registered.set()
+        self._add_to_buffer("debug", "INTERNAL_CLIENT: Registration acknowledged by server", "info")
+
+    def _tx_worker(self):
+        """Emit queued outbound events, batching bursts of 'message' events; runs on the writer thread."""
+        while True:
+            items = [self._tx_queue.get()]
+            while True:
+                try:
+                    items.append(self._tx_queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            client = self.internal_sio_client
+            if not client or not client.connected:
+                self.logger.warning(f"Dropping {len(items)} outbound event(s): internal client not connected.")
+                self._add_to_buffer("debug", f"INTERNAL_CLIENT_WARN: Dropped {len(items)} queued event(s) - not connected.", "warning")
+                continue
+
+            # Runs of 'message' events go out as one frame; other events keep
+            # their own handlers on the server. Order is preserved
+            messages = []
+            try:
+                for event, payload in items + [(None, None)]:
+                    if event == 'message':
+                        messages.append(payload)
+                        continue
+                    if len(messages) == 1:
+                        client.emit('message', messages[0])
+                    elif messages:
+                        client.emit('message_batch', messages)
+                    messages = []
+                    if event is not None:
+                        client.emit(event, payload)
+            except Exception as e:
+                self.logger.error(f"Failed to emit via internal client: {e}", exc_info=True)
+                self._add_to_buffer("debug", f"INTERNAL_CLIENT_ERROR: Failed to emit: {e}", "error")
+                self._add_to_buffer("status", f"ERROR: Failed to send message: {e}", "error")
+
     def _start_internal_client_connection(self):
         """Sets up the internal client (if needed) and starts the connection thread."""
         if self.internal_sio_connected.is_set():
@@ -421,8 +654,13 @@ class ProcessManager:
             self.logger.warning("Internal client connection attempt already in progress.")
             return
 
+        # The client and its handlers are built once and reconnected across
+        # server restarts; connect() on a live socket would just raise
         if not self.internal_sio_client:
             self._setup_internal_client()
+        elif self.internal_sio_client.connected:
+            self.logger.info("Internal client socket still open, not reconnecting.")
+            return
 
         self.logger.info("Starting internal client connection thread.")
         self.internal_sio_connect_thread = threading.Thread(
@@ -444,6 +682,7 @@ class ProcessManager:
             self.logger.info("Internal client not connected or not initialized.")
 
         self.internal_sio_connected.clear()
+        self.internal_sio_registered.clear()
 
         if self.internal_sio_connect_thread and self.internal_sio_connect_thread.is_alive():
             self.logger.debug("Waiting briefly for internal connection thread to potentially finish...")
@@ -478,6 +717,7 @@ class ProcessManager:
         self._add_to_buffer("status", "Stopping screenshot manager...", "info")
         if self.screenshot_thread and self.screenshot_thread.is_alive():
             self.screenshot_stop_event.set()
+            self.screenshot_manager.wake()  # Don't wait out the capture interval
             self.screenshot_thread.join(timeout=5)
             if self.screenshot_thread.is_alive():
                 self.logger.warning("Screenshot manager thread did not stop gracefully.")
@@ -498,9 +738,9 @@ class ProcessManager:
         """Start all managed services."""
         self.logger.info("Starting all services...")
         self.start_socketio_server()
-        # Wait a bit longer for the server process to initialize before attempting client connection
-        self.logger.info("Waiting 2 seconds for server to initialize...")
-        time.sleep(2.0)
+        # Wait until the server is actually accepting connections before connecting the client
+        if not self._wait_for_port(self._connect_host, self._port, timeout=STARTUP_TIMEOUT):
+            self.logger.warning("Socket.IO server not accepting connections yet; connecting anyway.")
         # Explicitly attempt internal client connection
         self.logger.info("Attempting initial internal client connection...")
         self._start_internal_client_connection()
@@ -517,32 +757,32 @@ class ProcessManager:
 
     # --- Communication Methods ---
 
+    def _handle_not_connected(self, what: str):
+        """Report a send dropped for lack of a connection and reconnect if the server is up."""
+        debug_line, status_line = _NOT_CONNECTED_LINES[what]
+        self._add_to_buffer("debug", debug_line, "warning")
+        self._add_to_buffer("status", status_line, "warning")
+        if self._is_server_running():
+            self.logger.info("Attempting to reconnect internal client as server process is running.")
+            self._start_internal_client_connection()
+
     def post_message_to_socket(self, value: str, messageType: str = "info") -> bool:
         """Send a message via the internal Socket.IO client."""
-        self.logger.debug(f"Attempting to post message via internal client: type={messageType}, value='{value[:50]}...'")
-        if self.internal_sio_client and self.internal_sio_connected.is_set() and self.internal_sio_client.connected:
-            try:
-                payload = {
-                    'messageType': messageType,
-                    'value': value,
-                    'from': 'localBackend'
-                }
-                self.internal_sio_client.emit('message', payload)
-                self.logger.info(f"Message posted successfully via internal client: {payload}")
-                self._add_to_buffer("debug", f"SENDING MESSAGE (localBackend): Type={messageType}, Value='{value[:50]}...'", "info")
-                return True
-            except Exception as e:
-                self.logger.error(f"Failed to post message via internal client: {e}", exc_info=True)
-                self._add_to_buffer("debug", f"INTERNAL_CLIENT_ERROR: Failed to emit message: {e}", "error")
-                self._add_to_buffer("status", f"ERROR: Failed to send message: {e}", "error")
-                return False
+        preview = _preview(value)
+        self.logger.debug(f"Attempting to post message via internal client: type={messageType}, value='{preview}'")
+        if self.internal_sio_connected.is_set():
+            payload = {
+                'messageType': messageType,
+                'value': value,
+                'from': _SENDER
+            }
+            self._tx_queue.put(('message', payload))
+            self.logger.info(f"Message queued for internal client: type={messageType}, value='{preview}'")
+            self._add_to_buffer("debug", f"SENDING MESSAGE (localBackend): Type={messageType}, Value='{preview}'", "info")
+            return True
         else:
             self.logger.warning("Cannot post message: Internal client not connected.")
-            self._add_to_buffer("debug", "INTERNAL_CLIENT_WARN: Cannot post message - not connected.", "warning")
-            self._add_to_buffer("status", "WARNING: Cannot send message - Socket.IO not connected.", "warning")
-            if self.socketio_process and self.socketio_process.poll() is None:
-                self.logger.info("Attempting to reconnect internal client as server process is running.")
-                self._start_internal_client_connection()
+            self._handle_not_connected("message")
             return False
 
     def process_and_send_ocr_result(self, requester_sid: Optional[str] = None) -> bool:
@@ -561,9 +801,7 @@ class ProcessManager:
         # --- Add detailed check logging ---
         client_exists = self.internal_sio_client is not None
         self._add_to_buffer("debug", f"Internal client exists: {client_exists}", "info")
-        event_set = self.internal_sio_connected.is_set()
-        client_connected_prop = self.internal_sio_client.connected if client_exists else False
-        self.logger.debug(f"OCR Trigger Check: Client Exists={client_exists}, Event Set={event_set}, Client Property Connected={client_connected_prop}")
+        self.logger.debug(f"OCR Trigger Check: Client Exists={client_exists}, Event Set={self.internal_sio_connected.is_set()}")
         # --- End detailed check logging ---
 
         try:
@@ -574,8 +812,9 @@ class ProcessManager:
                 # Return False here as there's nothing to send
                 return False
             elif isinstance(ocr_text, str):
-                self.logger.info(f"Manual OCR processing successful: '{ocr_text[:50]}...'")
-                self._add_to_buffer("debug", f"Manual OCR successful: '{ocr_text[:50]}...'", "info")
+                preview = _preview(ocr_text)
+                self.logger.info(f"Manual OCR processing successful: '{preview}'")
+                self._add_to_buffer("debug", f"Manual OCR successful: '{preview}'", "info")
             else:
                 self.logger.error(f"Manual OCR processing returned unexpected type: {type(ocr_text)}")
                 self._add_to_buffer("debug", f"ERROR: Manual OCR returned unexpected type: {type(ocr_text)}", "error")
@@ -588,38 +827,26 @@ class ProcessManager:
             return False
 
         # Check connection status *after* OCR processing is done
-        client_exists = self.internal_sio_client is not None
-        event_set = self.internal_sio_connected.is_set()
-        client_connected_prop = self.internal_sio_client.connected if client_exists else False
+        if self.internal_sio_connected.is_set():
+            # The server now expects 'ocr_result' event. Built in its final
+            # shape: only requester_sid can be missing, so no None-filtering pass
+            payload = {
+                'text': ocr_text,
+                'timestamp': datetime.now().isoformat(),
+                'from': _SENDER
+            }
+            if requester_sid is not None:
+                payload['requester_sid'] = requester_sid
 
-        if client_exists and event_set and client_connected_prop:
-            try:
-                # The server now expects 'ocr_result' event
-                payload = {
-                    'text': ocr_text,
-                    'timestamp': datetime.now().isoformat(),
-                    'from': 'localBackend',
-                    # Include the original requester SID if available
-                    'requester_sid': requester_sid
-                }
-                # Remove None values from payload before sending
-                payload = {k: v for k, v in payload.items() if v is not None}
-
-                self.internal_sio_client.emit(MessageType.OCR_RESULT.value, payload)
-                self.logger.info(f"{trigger_source} OCR result sent successfully via internal client.")
-                self._add_to_buffer("debug", f"SENDING OCR RESULT ({trigger_source}): '{ocr_text[:50]}...'", "info")
-                return True
-            except Exception as e:
-                self.logger.error(f"Failed to send manual OCR result via internal client: {e}", exc_info=True)
-                self._add_to_buffer("debug", f"INTERNAL_CLIENT_ERROR: Failed to emit manual OCR result: {e}", "error")
-                self._add_to_buffer("status", f"ERROR sending OCR result: {e}", "error")
-                return False
+            self._tx_queue.put((_OCR_RESULT_EVENT, payload))
+            self.logger.info(f"{trigger_source} OCR result queued for internal client.")
+            self._add_to_buffer("debug", f"SENDING OCR RESULT ({trigger_source}): '{preview}'", "info")
+            return True
         else:
-            # Log the state again when the check fails
+            # Log the full state when the check fails
+            client_exists = self.internal_sio_client is not None
+            event_set = self.internal_sio_connected.is_set()
+            client_connected_prop = self.internal_sio_client.connected if client_exists else False
             self.logger.warning(f"Cannot send manual OCR result: Internal client not connected. State: Exists={client_exists}, Event Set={event_set}, Client Prop Connected={client_connected_prop}")
-            self._add_to_buffer("debug", "INTERNAL_CLIENT_WARN: Cannot send manual OCR - not connected.", "warning")
-            self._add_to_buffer("status", "WARNING: Cannot send OCR - Socket.IO not connected.", "warning")
-            if self.socketio_process and self.socketio_process.poll() is None:
-                self.logger.info("Attempting to reconnect internal client as server process is running.")
-                self._start_internal_client_connection()
+            self._handle_not_connected("OCR")
             return False
\ No newline at end of file
@@ -15,11 +15,40 @@ import time
 import json
 import logging
 import threading
+from collections import deque
 from datetime import datetime
 
 from .path_config import get_temp_dir, get_logs_dir, get_frequency_config_file
+from .log_utils import attach_queued_file_handler
 from .ocr_processor import OCRProcessor
-from .message_system import MessageManager, MessageLevel, MessageCategory
+from .message_system import MessageManager, MessageLevel, MessageCategory, BufferID
+
+# Capture frequency bounds (seconds), shared with the screenshot view
+MIN_FREQUENCY = 0.1
+MAX_FREQUENCY = 60.0
+DEFAULT_FREQUENCY = 4.0
+
+# Lines kept in the legacy output buffer
+LEGACY_BUFFER_SIZE = 1000
+
+# Lookups for _add_to_buffer, built once instead of per message
+_LEVELS = {level.name.lower(): level for level in MessageLevel}
+_DEFAULT_EMOJI = "ℹ️"
+
+
+def read_frequency_config(config_file=None):
+    """Read the capture frequency from the frequency config file.
+
+    Returns the value as a float, or None if the file or key is missing.
+    Raises ValueError/TypeError for malformed content (json.JSONDecodeError
+    is a ValueError). Range checking is left to the caller.
+    """
+    config_file = config_file or get_frequency_config_file()
+    if not os.path.exists(config_file):
+        return None
+    with open(config_file) as f:
+        value = json.load(f).get('frequency')
+    return None if value is None else float(value)
 
 class ScreenshotManager:
     """Manages continuous screenshot capture and cleanup.
@@ -42,19 +71,26 @@ class ScreenshotManager:
     def __init__(self, message_manager: MessageManager):
         self.ocr_processor = OCRProcessor()
         self.logger = self._setup_logging()
-        self.screenshot_interval = 4.0
+        self.screenshot_interval = DEFAULT_FREQUENCY
+        # (inode, mtime_ns, size) of the frequency config last parsed; the UI
+        # replaces the file atomically, so any rewrite changes the inode
+        self._freq_stat_key = None
         
         # Store the passed message manager instance
         self.message_manager = message_manager
         
-        # Initialize legacy buffer
-        self.output_buffer = []
+        # Initialize legacy buffer (ring buffer: oldest lines drop off in O(1)).
+        # Holds (message, emoji, level); lines are formatted when read
+        self.output_buffer = deque(maxlen=LEGACY_BUFFER_SIZE)
         
         self.load_screenshot_config()
         
         # State flags
         self._running = False
         self._paused = False
+        # Set by wake() so the capture loop reacts to pause/reload/stop
+        # requests immediately instead of polling for them
+        self._wake_event = threading.Event()
 
     def _setup_logging(self):
         """Configure screenshot manager logging."""
@@ -64,12 +100,8 @@ class ScreenshotManager:
         logger.setLevel(logging.INFO)
         
         if not logger.handlers:
-            handler = logging.FileHandler(log_file)
-            formatter = logging.Formatter(
-                '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-            )
-            handler.setFormatter(formatter)
-            logger.addHandler(handler)
+            # File writes happen on a listener thread, off the capture loop
+            attach_queued_file_handler(logger, log_file)
         
         return logger
 
@@ -78,17 +110,24 @@ class ScreenshotManager:
         try:
             config_file = get_frequency_config_file()
             if os.path.exists(config_file):
-                with open(config_file) as f:
-                    loaded_interval = float(json.load(f).get('frequency', 4.0))
-                    if 0.1 <= loaded_interval <= 60.0:
-                        if self.screenshot_interval != loaded_interval:
-                            self.screenshot_interval = loaded_interval
-                            self._add_to_buffer(f"Screenshot frequency updated to {self.screenshot_interval:.1f}s", "info")
-                            self.logger.info(f"Screenshot frequency updated to {self.screenshot_interval:.1f}s")
-                        else:
-                            self.logger.debug(f"Screenshot frequency already {self.screenshot_interval:.1f}s, no change.")
+                st = os.stat(config_file)
+                stat_key = (st.st_ino, st.st_mtime_ns, st.st_size)
+                if stat_key == self._freq_stat_key:
+                    self.logger.debug("Frequency config unchanged since last load, skipping parse.")
+                    return
+                loaded_interval = read_frequency_config(config_file)
+                if loaded_interval is None:
+                    loaded_interval = DEFAULT_FREQUENCY
+                self._freq_stat_key = stat_key
+                if MIN_FREQUENCY <= loaded_interval <= MAX_FREQUENCY:
+                    if self.screenshot_interval != loaded_interval:
+                        self.screenshot_interval = loaded_interval
+                        self._add_to_buffer(f"Screenshot frequency updated to {self.screenshot_interval:.1f}s", "info")
+                        self.logger.info(f"Screenshot frequency updated to {self.screenshot_interval:.1f}s")
                     else:
-                        self.logger.warning(f"Loaded frequency {loaded_interval} out of range (0.1-60.0), keeping current value {self.screenshot_interval:.1f}s.")
+                        self.logger.debug(f"Screenshot frequency already {self.screenshot_interval:.1f}s, no change.")
+                else:
+                    self.logger.warning(f"Loaded frequency {loaded_interval} out of range ({MIN_FREQUENCY}-{MAX_FREQUENCY}), keeping current value {self.screenshot_interval:.1f}s.")
             else:
                 self.logger.info(f"Frequency config file not found at {config_file}, using current value {self.screenshot_interval:.1f}s.")
         except (ValueError, TypeError, json.JSONDecodeError) as e:
@@ -98,32 +137,27 @@ class ScreenshotManager:
 
     def _add_to_buffer(self, message, level="info"):
         """Add a message to the output buffer with timestamp."""
-        try:
-            msg_level = getattr(MessageLevel, level.upper(), MessageLevel.INFO)
-        except ValueError:
-            msg_level = MessageLevel.INFO
-            
-        if "screenshot" in message.lower():
-            category = MessageCategory.SCREENSHOT
-        elif "deleted" in message.lower() or "cleaned" in message.lower():
-            category = MessageCategory.SYSTEM
+        lowered = message.lower()
+        if "screenshot" in lowered:
+            category, emoji = MessageCategory.SCREENSHOT, "📸"
+        elif "deleted" in lowered:
+            category, emoji = MessageCategory.SYSTEM, "🗑️"
+        elif "cleaned" in lowered:
+            category, emoji = MessageCategory.SYSTEM, _DEFAULT_EMOJI
         else:
-            category = MessageCategory.SCREENSHOT
+            category, emoji = MessageCategory.SCREENSHOT, _DEFAULT_EMOJI
             
-        self.message_manager.add_message(
+        msg = self.message_manager.add_message(
             content=message,
-            level=msg_level,
+            level=_LEVELS.get(level, MessageLevel.INFO),
             category=category,
             source="screenshot",
-            buffer_name="screenshot"
+            buffer_name=BufferID.SCREENSHOT
         )
         
-        timestamp = time.strftime("%H:%M:%S")
-        emoji = "📸" if "screenshot" in message.lower() else "🗑️" if "deleted" in message.lower() else "ℹ️"
-        self.output_buffer.append(f"{timestamp} {emoji} {message} ({level})")
-        
-        if len(self.output_buffer) > 1000:
-            self.output_buffer.pop(0)
+        # Legacy lines are only read as a fallback in get_output, so keep the
+        # parts and format them there rather than on every message
+        self.output_buffer.append((msg, emoji, level))
 
     def process_latest_screenshot(self, manual_trigger: bool = False):
         """Process the most recent screenshot."""
@@ -141,11 +175,30 @@ class ScreenshotManager:
 
     def get_output(self):
         """Get the current output buffer."""
-        messages = self.message_manager.get_formatted_messages("screenshot")
+        messages = self.message_manager.get_formatted_messages(BufferID.SCREENSHOT)
         if not messages:
-            return self.output_buffer.copy()
+            return ["%s %s %s (%s)" % (msg.formatted_timestamp, emoji, msg.content, level)
+                    for msg, emoji, level in self.output_buffer]
         return messages
 
+    def wake(self):
+        """Wake the capture loop early, e.g. after a pause/reload signal file was written or on stop."""
+        self._wake_event.set()
+
+    def _check_reload_signal(self, reload_file):
+        """Reload the frequency config if the reload signal file exists, then remove the signal."""
+        if not os.path.exists(reload_file):
+            return
+        self.logger.info("Reload frequency signal detected.")
+        self.load_screenshot_config()
+        try:
+            os.remove(reload_file)
+            self.logger.info("Reload frequency signal file removed.")
+        except OSError as e:
+            self.logger.warning(f"Could not remove reload signal file: {e}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error removing reload signal file: {e}", exc_info=True)
+
     def get_status(self):
         """Returns the current status of the Screenshot Manager."""
         if not self._running:
@@ -173,7 +226,10 @@ class ScreenshotManager:
                         self._paused = True
                         self._add_to_buffer("Screenshot capture paused.", "info")
                         self.logger.info("Screenshot capture paused.")
-                    time.sleep(1)
+                    # Resume is signalled through wake(); the timeout also
+                    # picks up the file being removed by something else
+                    self._wake_event.wait(1.0)
+                    self._wake_event.clear()
                     continue
                 else:
                     if self._paused:
@@ -181,6 +237,7 @@ class ScreenshotManager:
                         self._add_to_buffer("Screenshot capture resumed.", "info")
                         self.logger.info("Screenshot capture resumed.")
 
+                last_capture = time.monotonic()
                 filepath = self.ocr_processor.capture_screenshot()
                 if filepath:
                     filename = os.path.basename(filepath)
@@ -190,26 +247,25 @@ class ScreenshotManager:
                 if deleted:
                     self._add_to_buffer(f"Cleaned up {deleted} old screenshots", "info")
 
-                if os.path.exists(reload_file):
-                    self.logger.info("Reload frequency signal detected.")
-                    self.load_screenshot_config()
-                    try:
-                        os.remove(reload_file)
-                        self.logger.info("Reload frequency signal file removed.")
-                    except OSError as e:
-                        self.logger.warning(f"Could not remove reload signal file: {e}")
-                    except Exception as e:
-                        self.logger.error(f"Unexpected error removing reload signal file: {e}", exc_info=True)
-
-                wait_until = time.time() + self.screenshot_interval
-                while time.time() < wait_until and not stop_event.is_set():
+                self._check_reload_signal(reload_file)
+
+                # Sleep until the next deadline on the monotonic clock (immune
+                # to wall-clock jumps); wake() cuts the wait short.
+                while not stop_event.is_set():
+                    remaining = last_capture + self.screenshot_interval - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    if not self._wake_event.wait(remaining):
+                        break
+                    self._wake_event.clear()
                     if os.path.exists(pause_file):
                         if not self._paused:
                             self._paused = True
                             self._add_to_buffer("Screenshot capture paused.", "info")
                             self.logger.info("Screenshot capture paused during wait.")
                         break
-                    time.sleep(0.1)
+                    # A new frequency moves the deadline relative to the last capture
+                    self._check_reload_signal(reload_file)
 
             except Exception as e:
                 self.logger.error(f"Error in screenshot manager run loop: {e}", exc_info=True)
@@ -8,6 +8,7 @@ import logging  # Import logging
 from .base_view import BaseView
 from .color_scheme import *  # Ensure color_scheme import is relative
 from .path_config import get_temp_dir, get_frequency_config_file, get_screenshots_dir
+from .screenshot_manager import read_frequency_config, MIN_FREQUENCY, MAX_FREQUENCY, DEFAULT_FREQUENCY
 
 # Get logger for this module
 logger = logging.getLogger(__name__)
@@ -16,7 +17,7 @@ class ScreenshotView(BaseView):
     def __init__(self, stdscr, process_manager):
         super().__init__(stdscr, process_manager)
         self.view_name = "screenshot"
-        self.current_frequency = 4.0  # Default
+        self.current_frequency = DEFAULT_FREQUENCY
         self.is_paused = False
         self.load_screenshot_frequency()
 
@@ -60,10 +61,10 @@ class ScreenshotView(BaseView):
         elif key == ord('o'):
             self.open_screenshots_folder()
         elif key == curses.KEY_LEFT:
-            self.current_frequency = max(0.1, self.current_frequency - 0.5)
+            self.current_frequency = max(MIN_FREQUENCY, self.current_frequency - 0.5)
             self.save_screenshot_frequency()
         elif key == curses.KEY_RIGHT:
-            self.current_frequency = min(60.0, self.current_frequency + 0.5)
+            self.current_frequency = min(MAX_FREQUENCY, self.current_frequency + 0.5)
             self.save_screenshot_frequency()
         elif key == ord('s'):
             new_freq = self.get_frequency_input()
@@ -85,6 +86,7 @@ class ScreenshotView(BaseView):
                 # Create an empty file (like 'touch' command)
                 with open(pause_signal_file, 'a'):
                     os.utime(pause_signal_file, None)
+                self.process_manager.screenshot_manager.wake()
                 self.is_paused = True  # Update UI state optimistically
                 self.process_manager._add_to_buffer("screenshot", "Screenshot capture pause requested.", "info")
                 logger.info("Pause signal file created.")
@@ -99,6 +101,7 @@ class ScreenshotView(BaseView):
                     logger.info("Pause signal file removed.")
                 else:
                     logger.info("Pause signal file already removed or never existed.")
+                self.process_manager.screenshot_manager.wake()
                 self.is_paused = False  # Update UI state optimistically
                 self.process_manager._add_to_buffer("screenshot", "Screenshot capture resume requested.", "info")
             except FileNotFoundError:
@@ -116,10 +119,18 @@ class ScreenshotView(BaseView):
         try:
             if sys.platform == "win32":
                 os.startfile(path)
-            elif sys.platform == "darwin":
-                subprocess.Popen(["open", path])
             else:
-                subprocess.Popen(["xdg-open", path])
+                opener = "open" if sys.platform == "darwin" else "xdg-open"
+                # Fire and forget: detached from the UI's session and terminal so
+                # the opener's output can't draw over curses, and never waited on
+                subprocess.Popen(
+                    [opener, path],
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    start_new_session=True,
+                    close_fds=True
+                )
             self.process_manager._add_to_buffer("screenshot", f"Opened folder: {path}", "info")
         except Exception as e:
             logging.error(f"Error opening screenshots folder '{path}': {e}", exc_info=True)
@@ -128,38 +139,32 @@ class ScreenshotView(BaseView):
     def load_screenshot_frequency(self):
         """Load the screenshot frequency from config file."""
         try:
-            config_file = get_frequency_config_file()
-            if os.path.exists(config_file):
-                with open(config_file, 'r') as f:
-                    config_data = json.load(f)
-                    freq_value = config_data.get('frequency')
-                    if freq_value is not None:
-                        try:
-                            freq_value = float(freq_value)
-                            if 0.1 <= freq_value <= 60.0:
-                                self.current_frequency = freq_value
-                            else:
-                                logging.warning(f"Loaded frequency {freq_value} out of range, using default.")
-                                self.current_frequency = 4.0
-                        except (TypeError, ValueError):
-                            logging.warning(f"Invalid frequency '{freq_value}' in config, using default.")
-                            self.current_frequency = 4.0
-                    else:
-                        self.current_frequency = 4.0
+            freq_value = read_frequency_config()
+            if freq_value is None:
+                self.current_frequency = DEFAULT_FREQUENCY
+            elif MIN_FREQUENCY <= freq_value <= MAX_FREQUENCY:
+                self.current_frequency = freq_value
             else:
-                self.current_frequency = 4.0
-
+                logging.warning(f"Loaded frequency {freq_value} out of range, using default.")
+                self.current_frequency = DEFAULT_FREQUENCY
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Invalid frequency in config ({e}), using default.")
+            self.current_frequency = DEFAULT_FREQUENCY
         except Exception as e:
             logging.error(f"Error loading frequency config: {e}", exc_info=True)
-            self.current_frequency = 4.0
+            self.current_frequency = DEFAULT_FREQUENCY
 
     def save_screenshot_frequency(self):
         """Save the current screenshot frequency to config and signal reload."""
         try:
             config_file = get_frequency_config_file()
             os.makedirs(os.path.dirname(config_file), exist_ok=True)
-            with open(config_file, "w") as f:
+            # Write to a temp file and rename over the config so the capture
+            # thread never reads a half-written file
+            tmp_file = f"{config_file}.tmp"
+            with open(tmp_file, "w") as f:
                 json.dump({'frequency': self.current_frequency}, f)
+            os.replace(tmp_file, config_file)
             logger.info(f"Screenshot frequency config saved: {self.current_frequency:.1f}s")
 
             # Signal the ScreenshotManager to reload the frequency
@@ -168,6 +173,7 @@ class ScreenshotView(BaseView):
                 # Create an empty file (like 'touch' command)
                 with open(signal_file, 'a'):
                     os.utime(signal_file, None)
+                self.process_manager.screenshot_manager.wake()
                 # Update message to reflect request, not immediate change
                 self.process_manager._add_to_buffer("screenshot", f"Frequency change to {self.current_frequency:.1f}s requested.", "info")
                 logger.info("Frequency reload signal file created.")
@@ -215,15 +221,16 @@ class ScreenshotView(BaseView):
             curses.curs_set(0)
             del input_win
             self.stdscr.touchwin()
-            self.stdscr.refresh()
+            self.stdscr.noutrefresh() # Flushed by the next frame's doupdate()
+            self.invalidate()
 
         if freq_str:
             try:
                 freq = float(freq_str)
-                if 0.1 <= freq <= 60.0:
+                if MIN_FREQUENCY <= freq <= MAX_FREQUENCY:
                     return freq
                 else:
-                    self.process_manager._add_to_buffer("status", f"Frequency {freq} out of range (0.1-60.0)", "warning")
+                    self.process_manager._add_to_buffer("status", f"Frequency {freq} out of range ({MIN_FREQUENCY}-{MAX_FREQUENCY})", "warning")
             except ValueError:
                 self.process_manager._add_to_buffer("status", f"Invalid frequency input: '{freq_str}'", "warning")
         return None
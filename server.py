@@ -40,7 +40,8 @@ if str(project_root) not in sys.path:
 from Threethreeter.config_loader import config as config_manager
 from Threethreeter.message_utils import (
     create_socket_message, create_client_count_message,
-    create_welcome_message, create_join_leave_message, MessageType
+    create_welcome_message, create_join_leave_message, MessageType,
+    decode_internal_ocr_text, socketio_json
 )
 from Threethreeter.event_utils import EventType
 from Threethreeter.discovery_manager import DiscoveryManager
@@ -48,7 +49,7 @@ from Threethreeter.discovery_manager import DiscoveryManager
 # --- Globals ---
 config_data = config_manager.config  # Get the loaded config dictionary
 logger = logging.getLogger(__name__)  # Get logger instance, assumes setup elsewhere
-sio = socketio.AsyncServer(async_mode='aiohttp', cors_allowed_origins='*')
+sio = socketio.AsyncServer(async_mode='aiohttp', cors_allowed_origins='*', json=socketio_json)
 app = web.Application()
 sio.attach(app)
 
@@ -294,6 +295,16 @@ async def handle_default_message(sid, data):
         sys.stderr.flush()
     # --- END REBROADCAST LOGIC ---
 
+@sio.on('message_batch')
+async def handle_message_batch(sid, data):
+    """Handle a list of generic messages coalesced by the sender into one frame."""
+    if not isinstance(data, list):
+        logger.warning(f"Ignoring malformed 'message_batch' from {sid}: {data}")
+        return
+    for item in data:
+        if isinstance(item, dict):
+            await handle_default_message(sid, item)
+
 @sio.event
 async def register_internal_client(sid: str, data: Optional[Dict] = None):
     """Allows the macOS agent to identify itself as the internal client."""
@@ -323,6 +334,8 @@ async def register_internal_client(sid: str, data: Optional[Dict] = None):
         await sio.emit(EventType.CLIENT_JOINED_ROOM.value, join_event_payload, room=current_room)
         await emit_client_count_update() # Update count if type changed or room joined
 
+    return True  # Acknowledges the registration to the client's emit callback
+
 # Renamed from trigger_ocr to handle the message type
 @sio.on(MessageType.TRIGGER_OCR.value)
 async def on_trigger_ocr_message(sid: str, data: Any): # Add data parameter
@@ -371,7 +384,7 @@ async def on_internal_ocr_result(sid, data):
         return
 
     original_requester_sid = data.get('requester_sid')
-    ocr_text = data.get('text')
+    ocr_text = decode_internal_ocr_text(data)  # Handles gzip-compressed large results
     # logger.info(f"Received OCR result from internal client for requester {original_requester_sid}.")
 
     if ocr_text is None:
@@ -384,7 +397,7 @@ async def on_internal_ocr_result(sid, data):
     await sio.emit(EventType.OCR_PROCESSING_COMPLETED.value, completion_payload, room=current_room)
 
     # Emit processed screenshot event with preview
-    preview = (ocr_text[:50] + '...') if len(ocr_text) > 50 else ocr_text
+    preview = ocr_text[:50] + ('...' if len(ocr_text) > 50 else '')
     processed_payload = {"success": True, "text_preview": preview}
     await sio.emit(EventType.PROCESSED_SCREENSHOT.value, processed_payload, room=current_room)
 
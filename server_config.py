@@ -20,6 +20,7 @@ Key Features:
 - Add configuration export/import functionality
 """
 
+import os
 import sys
 import json
 import logging
@@ -63,6 +64,26 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 # In-memory cache for the configuration
 _config_cache: Optional[Dict[str, Any]] = None
 
+# Parsed JSON files keyed by path -> ((st_mtime_ns, st_size), data)
+_json_cache: Dict[str, tuple] = {}
+
+def load_json_cached(path) -> Any:
+    """Parse a JSON file, reusing the previous result while its mtime and size are unchanged.
+
+    The returned object is shared between callers and must not be mutated.
+    Raises the same exceptions as open()/json.load().
+    """
+    path = str(path)
+    st = os.stat(path)
+    stat_key = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    with open(path, 'r') as f:
+        data = json.load(f)
+    _json_cache[path] = (stat_key, data)
+    return data
+
 def _deep_merge_dicts(source: Dict[str, Any], destination: Dict[str, Any]) -> Dict[str, Any]:
     """Recursively merge source dict into destination dict."""
     for key, value in source.items():
@@ -81,15 +102,16 @@ def _load_config() -> Dict[str, Any]:
 
     if SERVER_CONFIG_FILE.exists():
         try:
-            with open(SERVER_CONFIG_FILE, 'r') as f:
-                loaded_config = json.load(f)
-                logger.debug(f"Raw config loaded from {SERVER_CONFIG_FILE}: {loaded_config}") # Added logging
-                if isinstance(loaded_config, dict):
-                    config = _deep_merge_dicts(loaded_config, config)
-                else:
-                    logger.error(f"Invalid config format in {SERVER_CONFIG_FILE}. Expected a dictionary, got {type(loaded_config)}. Using defaults.")
-                    # Reset to defaults if file format is wrong
-                    config = copy.deepcopy(DEFAULT_CONFIG)
+            # Parsed copy is reused until the file changes on disk; deep-copy it
+            # before merging so callers never share state with the cache
+            loaded_config = copy.deepcopy(load_json_cached(SERVER_CONFIG_FILE))
+            logger.debug(f"Raw config loaded from {SERVER_CONFIG_FILE}: {loaded_config}") # Added logging
+            if isinstance(loaded_config, dict):
+                config = _deep_merge_dicts(loaded_config, config)
+            else:
+                logger.error(f"Invalid config format in {SERVER_CONFIG_FILE}. Expected a dictionary, got {type(loaded_config)}. Using defaults.")
+                # Reset to defaults if file format is wrong
+                config = copy.deepcopy(DEFAULT_CONFIG)
         except json.JSONDecodeError as e:
             logger.error(f"Error decoding JSON from {SERVER_CONFIG_FILE}: {e}. Using default configuration.")
             # Reset to defaults on JSON error
@@ -108,11 +130,12 @@ def _load_config() -> Dict[str, Any]:
 
 def get_server_config() -> Dict[str, Any]:
     """Returns the current server configuration, loading if necessary."""
-    # Always reload from file for now to ensure freshness during debugging
+    # Always rebuild for now to ensure freshness during debugging; the file is
+    # only re-read and re-parsed when its mtime/size change
     # if _config_cache is None:
     #     _load_config()
     # return _config_cache if _config_cache is not None else copy.deepcopy(DEFAULT_CONFIG)
-    return _load_config() # Force reload on each call during debugging
+    return _load_config()
 
 def save_server_config(config_data: Dict[str, Any]) -> bool:
     """Saves the configuration data to the file."""
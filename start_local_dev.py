@@ -26,6 +26,7 @@ import curses
 import sys
 import argparse
 import logging
+import logging.handlers
 import traceback
 from typing import Optional
 
@@ -35,6 +36,7 @@ try:
     from .config_loader import config
     from .process_manager import ProcessManager
     from .terminal_ui import TerminalUI
+    from .log_utils import attach_queued_file_handler
 except ImportError as e:
     print(f"Error importing required modules: {e}", file=sys.stderr)  # Print import errors to stderr
     print("Please ensure you're running from the correct directory and all dependencies are installed.", file=sys.stderr)
@@ -43,29 +45,28 @@ except ImportError as e:
 # Get a logger instance for this module specifically
 module_logger = logging.getLogger(__name__)
 
-def setup_logging():
+def setup_logging() -> logging.handlers.QueueListener:
+    """Route root logging through a queue to root.log.
+
+    Returns the listener that writes the file; stop it on shutdown so
+    queued records are flushed.
+    """
     logging.root.handlers = []
     logging.basicConfig(level=logging.INFO)
 
     # Configure root logger
     root_logger = logging.getLogger()
     
-    # Create a file handler for the root logger
-    root_file_handler = logging.FileHandler("root.log")
-    root_file_handler.setLevel(logging.INFO)
-    root_formatter = logging.Formatter(
-        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
-    root_file_handler.setFormatter(root_formatter)
-    
-    # Remove all handlers and add only the file handler
+    # Only a queue handler on the root logger; the listener thread writes
+    # root.log so logging callers never wait on disk
     root_logger.handlers = []
-    root_logger.addHandler(root_file_handler)
+    listener = attach_queued_file_handler(root_logger, "root.log", level=logging.INFO, stop_at_exit=False)
     
     # Set level for other modules
     logging.getLogger("werkzeug").setLevel(logging.ERROR)
     logging.getLogger("engineio").setLevel(logging.ERROR)
     logging.getLogger("socketio").setLevel(logging.ERROR)
+    return listener
 
 def setup_environment() -> Optional[ProcessManager]:
     """Initialize application environment and process manager."""
@@ -104,7 +105,7 @@ def main() -> int:
     # Configure logging level based on args
     if args.debug:
         config.set("logging", "level", value="DEBUG")
-    setup_logging()
+    log_listener = setup_logging()
 
     module_logger.info("Threethreeter Process Manager starting...")
 
@@ -192,6 +193,7 @@ def main() -> int:
             module_logger.info("Process manager not initialized, skipping service shutdown.")
 
         module_logger.info("Application shutdown complete")
+        log_listener.stop()
 
     return 0
 
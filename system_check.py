@@ -24,16 +24,17 @@ import os
 import sys
 import shutil
 import platform
+import importlib.util
 import subprocess
 from typing import List, Tuple
 
 def check_python_version() -> Tuple[bool, str]:
     """Check if Python version meets requirements."""
     major, minor = sys.version_info[:2]
-    required = (3, 9)
+    required = (3, 10)
     if (major, minor) >= required:
         return True, f"Python {major}.{minor} (✓)"
-    return False, f"Python {major}.{minor} (✗) - Requires 3.9+"
+    return False, f"Python {major}.{minor} (✗) - Requires 3.10+"
 
 def check_tesseract() -> Tuple[bool, str]:
     """Check if Tesseract OCR is installed."""
@@ -57,6 +58,23 @@ def check_socketio() -> Tuple[bool, str]:
     except ImportError:
         return False, "Socket.IO not found (✗)"
 
+def check_optional_module(module: str, purpose: str) -> Tuple[bool, str]:
+    """Check whether an optional accelerator module is installed (never critical)."""
+    if importlib.util.find_spec(module) is not None:
+        return True, f"{purpose} (✓)"
+    return False, f"{purpose} - optional, pip install {module} (-)"
+
+# Optional packages that are picked up automatically when installed
+OPTIONAL_ACCELERATORS = [
+    # websocket-client (the Socket.IO client transport) uses wsaccel's C
+    # frame masking and UTF-8 validation when it is importable
+    ("wsaccel", "WebSocket frame masking in C"),
+    ("orjson", "Fast JSON config load/save"),
+    ("fastjsonschema", "Compiled config schema validation"),
+    ("mss", "Fast screen capture"),
+    ("tesserocr", "In-process Tesseract OCR"),
+]
+
 def check_directories() -> List[Tuple[str, bool, str]]:
     """Check required directories exist and are writable."""
     from .path_config import (
@@ -109,6 +127,12 @@ def print_system_status():
     for name, (status, message) in checks:
         print(f"{name:<15} {message}")
     
+    print("\nOptional Accelerators:")
+    print("-" * width)
+    for module, purpose in OPTIONAL_ACCELERATORS:
+        status, message = check_optional_module(module, purpose)
+        print(f"{module:<15} {message}")
+    
     # Check directories
     print("\nDirectory Access:")
     print("-" * width)
@@ -30,6 +30,7 @@ class TerminalUI:
             self.current_view = new_view
             if self.stdscr:
                 self.stdscr.clear()  # Clear screen to ensure clean redraw
+                self.views[self.current_view].invalidate()
                 self.views[self.current_view].draw()  # Draw the new view immediately
         else:
             logging.warning(f"Attempted to switch to non-existent view: {new_view}")
@@ -100,6 +101,7 @@ class TerminalUI:
                     self.height, self.width = stdscr.getmaxyx()
                     for view in self.views.values():
                         view.resize(self.height, self.width)
+                        view.invalidate()
                     stdscr.clear()  # Force full redraw on resize
                     last_refresh_time = 0  # Force immediate redraw
 
@@ -112,8 +114,12 @@ class TerminalUI:
                     self.process_manager.logger.debug(f"TerminalUI.run received key: {key} (char: {key_char})")
                     # --- End temporary logging ---
 
+                    view = self.views.get(self.current_view)
+                    if view is not None and view.show_help:
+                        # While the help overlay is up, any key just dismisses it
+                        view.handle_input(key)
                     # First, try global handling (quit, view switch)
-                    if not self.handle_input(key):
+                    elif not self.handle_input(key):
                         # If not handled globally, pass to current view
                         if self.current_view and self.current_view in self.views:
                             if not self.views[self.current_view].handle_input(key):
@@ -124,6 +130,8 @@ class TerminalUI:
                             break
 
                     # Input was handled (or ignored), force refresh potentially sooner
+                    if self.current_view in self.views:
+                        self.views[self.current_view].mark_dirty()
                     last_refresh_time = 0
 
                 # Refresh screen periodically or after input